@@ -22,6 +22,11 @@ from .dbf import DBF
 from .deprecated_dbf import open, read
 from .exceptions import *
 from .field_parser import FieldParser, InvalidValue
+from .index import NDXIndex
+from .hashindex import HashIndex
+from .predicates import Equals, In, Between
+from .record import Record, LazyRecord
+from .parallel import ParallelReader
 
 # Prevent splat import.
 __all__ = []
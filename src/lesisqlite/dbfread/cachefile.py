@@ -0,0 +1,184 @@
+"""
+Files with data derived from a table, saved to be reused later.
+
+Each cache file holds a signature and the data. The data is only used
+if the signature is the same as for the table as it is now.
+
+Cache files are written with marshal, which can't run code when a file
+is loaded, and are only loaded from directories that no other user
+can write to. Values marshal can't store are converted column by
+column with encode_column() and decode_column().
+"""
+import os
+import sys
+import stat
+import marshal
+import hashlib
+import datetime
+import tempfile
+from decimal import Decimal
+
+PY2 = sys.version_info[0] == 2
+
+# Types marshal can store as they are.
+if PY2:
+    _MARSHAL_TYPES = {type(None), bool, int, long, float, str, unicode}
+else:
+    _MARSHAL_TYPES = {type(None), bool, int, float, bytes, str}
+
+# Saved with the data since marshal files from other Python versions
+# may not load or may give values of other types.
+_FORMAT = (1, tuple(sys.version_info[:2]))
+
+
+def get_user_cache_dir(name):
+    """Return a cache directory only the current user can write to.
+
+    The directory is created in the temporary directory. Returns None
+    if it exists but is not private, for example because another user
+    created it first.
+    """
+    if hasattr(os, 'getuid'):
+        dirname = '{}-{}'.format(name, os.getuid())
+    else:
+        # The temporary directory is per user on Windows.
+        dirname = name
+    path = os.path.join(tempfile.gettempdir(), dirname)
+
+    try:
+        os.mkdir(path, 0o700)
+    except OSError:
+        pass
+
+    if _is_private(path, directory=True):
+        return path
+    else:
+        return None
+
+
+def _is_private(path, directory=False):
+    """Return True if only the current user can write to the path."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+
+    if directory and not stat.S_ISDIR(st.st_mode):
+        return False
+    elif not hasattr(os, 'getuid'):
+        return True
+    else:
+        return (st.st_uid == os.getuid()
+                and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+
+
+def get_cache_filename(table_filename, suffix, cache_dir):
+    """Return the name of a cache file for a table in cache_dir."""
+    name = '{}.{}'.format(os.path.basename(table_filename), suffix)
+    # Tables from different directories can share a name.
+    path = os.path.abspath(table_filename)
+    digest = hashlib.md5(path.encode('utf-8')).hexdigest()[:12]
+    return os.path.join(cache_dir, '{}.{}'.format(digest, name))
+
+
+def encode_column(values):
+    """Convert a list of values to something marshal can save.
+
+    Raises ValueError if the column has values of other types than
+    those marshal can store, dates, datetimes and decimals.
+    """
+    types = set(type(value) for value in values)
+    types.discard(type(None))
+
+    if types <= _MARSHAL_TYPES:
+        return ('', values)
+    elif types == {datetime.date}:
+        return ('date', [None if value is None else value.toordinal()
+                         for value in values])
+    elif types == {datetime.datetime}:
+        return ('datetime', [None if value is None else
+                             (value.toordinal(),
+                              value.hour, value.minute, value.second,
+                              value.microsecond)
+                             for value in values])
+    elif types == {Decimal}:
+        return ('decimal', [None if value is None else str(value)
+                            for value in values])
+    else:
+        raise ValueError('unable to save values of type {}'.format(
+            ', '.join(sorted(t.__name__ for t in types))))
+
+
+def decode_column(encoded):
+    """Convert a column saved with encode_column() back to values."""
+    kind, values = encoded
+    if kind == '':
+        return values
+    elif kind == 'date':
+        return [None if value is None else datetime.date.fromordinal(value)
+                for value in values]
+    elif kind == 'datetime':
+        return [None if value is None else
+                datetime.datetime.combine(
+                    datetime.date.fromordinal(value[0]),
+                    datetime.time(*value[1:]))
+                for value in values]
+    elif kind == 'decimal':
+        return [None if value is None else Decimal(value)
+                for value in values]
+    else:
+        raise ValueError('unknown column type {!r}'.format(kind))
+
+
+def load_cache(filename, signature):
+    """Return the data saved in a cache file.
+
+    Returns None if the file is missing, unreadable, writable by other
+    users or was saved with another signature.
+    """
+    if not (_is_private(os.path.dirname(filename) or os.curdir,
+                        directory=True)
+            and _is_private(filename)):
+        return None
+
+    try:
+        with open(filename, 'rb') as infile:
+            saved_format, saved_signature, data = marshal.load(infile)
+    except Exception:
+        return None
+
+    if saved_format != _FORMAT or saved_signature != signature:
+        return None
+    return data
+
+
+def save_cache(filename, signature, data):
+    """Save data to a cache file.
+
+    The data must only contain values marshal can store. Returns False
+    if the file could not be written.
+    """
+    try:
+        dirname = os.path.dirname(filename)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname, 0o700)
+
+        # Write to a temporary file first so a partly written file is
+        # never loaded.
+        tmpname = '{}.{}.tmp'.format(filename, os.getpid())
+        # Only the current user may write the file or it is not loaded.
+        fd = os.open(tmpname, os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+                     | getattr(os, 'O_BINARY', 0), 0o600)
+        try:
+            with os.fdopen(fd, 'wb') as outfile:
+                marshal.dump((_FORMAT, signature, data), outfile)
+        except ValueError:
+            os.remove(tmpname)
+            raise
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmpname, filename)
+        return True
+    except (IOError, OSError, ValueError):
+        # Read only directory or values marshal can't store.
+        return False
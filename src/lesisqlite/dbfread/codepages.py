@@ -74,3 +74,45 @@ def guess_encoding(language_driver):
         raise LookupError('Unable to guess encoding '
                           'for languager driver byte '
                           '0x{:x}'.format(language_driver))
+
+
+_single_byte_encodings = {}
+
+
+def is_single_byte(encoding):
+    """Return True if every byte decodes to exactly one character.
+
+    NUL and space must also decode to themselves, so that padding can
+    be stripped after decoding.
+    """
+    if encoding not in _single_byte_encodings:
+        try:
+            text = bytes(bytearray(range(256))).decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            result = False
+        else:
+            result = (len(text) == 256 and
+                      text[0] == u'\0' and
+                      text[32] == u' ')
+        _single_byte_encodings[encoding] = result
+
+    return _single_byte_encodings[encoding]
+
+
+def decode_text_column(values, encoding):
+    """Decode a list of fixed width text fields with a single decode.
+
+    All values must have the same length and encoding must be a single
+    byte encoding. Padding is stripped as for a 'C' field.
+    """
+    if not values:
+        return []
+
+    width = len(values[0])
+    if not width:
+        return [u''] * len(values)
+
+    # With a single byte encoding character offsets are byte offsets.
+    text = b''.join(values).decode(encoding)
+    return [text[i:i + width].rstrip(u'\0 ')
+            for i in range(0, len(text), width)]
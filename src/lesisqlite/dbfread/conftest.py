@@ -0,0 +1,97 @@
+"""
+Fixtures that write small DBF files for the tests.
+"""
+import struct
+import datetime
+import tempfile
+import contextlib
+from pytest import fixture
+
+# (name, type, length, decimal_count)
+PEOPLE_FIELDS = [
+    ('NAME', 'C', 16, 0),
+    ('BIRTHDATE', 'D', 8, 0),
+    ('KIDS', 'N', 3, 0),
+    ('HEIGHT', 'N', 6, 2),
+    ('MARRIED', 'L', 1, 0),
+]
+
+# (deletion flag, field values as stored in the file)
+PEOPLE_RECORDS = [
+    (b' ', [b'Alice', b'19870301', b'2', b'1.68', b'T']),
+    (b'*', [b'Deleted Guy', b'19791222', b'0', b'1.80', b'F']),
+    (b' ', [b'Bob', b'19801112', b'', b'', b'?']),
+]
+
+people = [{u'NAME': u'Alice',
+           u'BIRTHDATE': datetime.date(1987, 3, 1),
+           u'KIDS': 2,
+           u'HEIGHT': 1.68,
+           u'MARRIED': True},
+          {u'NAME': u'Bob',
+           u'BIRTHDATE': datetime.date(1980, 11, 12),
+           u'KIDS': None,
+           u'HEIGHT': None,
+           u'MARRIED': None}]
+
+deleted_people = [{u'NAME': u'Deleted Guy',
+                   u'BIRTHDATE': datetime.date(1979, 12, 22),
+                   u'KIDS': 0,
+                   u'HEIGHT': 1.8,
+                   u'MARRIED': False}]
+
+
+def encode_value(type, length, value):
+    if type in 'NF':
+        return value.rjust(length)
+    else:
+        return value.ljust(length)
+
+
+def write_dbf(filename, fields, records, language_driver=0x00):
+    """Write a dBase III table.
+
+    records is a list of (flag, values) where values are byte
+    strings as they appear in the file (before padding).
+    """
+    recordlen = 1 + sum(length for _, _, length, _ in fields)
+    headerlen = 32 + 32 * len(fields) + 1
+
+    with open(str(filename), 'wb') as outfile:
+        outfile.write(struct.pack('<BBBBLHHHBBLLLBBH',
+                                  0x03, 115, 6, 1,
+                                  len(records), headerlen, recordlen,
+                                  0, 0, 0, 0, 0, 0, 0, language_driver, 0))
+
+        for name, type, length, decimal_count in fields:
+            outfile.write(struct.pack('<11scLBBHBBBB7sB',
+                                      name.encode('ascii'),
+                                      type.encode('ascii'),
+                                      0, length, decimal_count,
+                                      0, 0, 0, 0, 0, b'', 0))
+        outfile.write(b'\r')
+
+        for flag, values in records:
+            outfile.write(flag)
+            for (_, type, length, _), value in zip(fields, values):
+                outfile.write(encode_value(type, length, value))
+        outfile.write(b'\x1a')
+
+    return str(filename)
+
+
+@contextlib.contextmanager
+def temp_directory(path):
+    """Use path as the temporary directory, so the tests don't write
+    cache directories to the real one."""
+    saved = tempfile.tempdir
+    tempfile.tempdir = str(path)
+    try:
+        yield
+    finally:
+        tempfile.tempdir = saved
+
+
+@fixture
+def people_dbf(tmpdir):
+    return write_dbf(tmpdir.join('people.dbf'), PEOPLE_FIELDS, PEOPLE_RECORDS)
@@ -5,10 +5,21 @@ import os
 import sys
 import datetime
 import collections
+import contextlib
+import array
 
 from .ifiles import ifind
+from .mapped_file import MappedFile
+from .readahead import read_chunks, read_ahead
+from .cachefile import (get_cache_filename, load_cache, save_cache,
+                        encode_column, decode_column)
 from .struct_parser import StructParser
 from .field_parser import FieldParser
+from .record_parser import RecordParser
+from .predicates import compile_predicates
+from .record import Record, LazyRecord
+from .record import make_record_class, make_lazy_record_class
+from .index import NDXIndex
 from .memo import find_memofile, open_memofile, FakeMemoFile, BinaryMemo
 from .codepages import guess_encoding
 from .dbversions import get_dbversion_string
@@ -52,6 +63,12 @@ DBFField = StructParser(
      'index_field_flag',
      ])
 
+# Bytes read at a time when records are read from the file.
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Change this if the format of saved snapshots changes.
+SNAPSHOT_VERSION = 3
+
 
 def expand_year(year):
     """Convert 2-digit year to 4-digit year."""
@@ -73,6 +90,9 @@ class RecordIterator(object):
     def __len__(self):
         return self._table._count_records(self._record_type)
 
+    def __getitem__(self, index):
+        return self._table._get_records(self._record_type, index)
+
 
 class DBF(object):
     """DBF table."""
@@ -82,7 +102,12 @@ class DBF(object):
                  recfactory=collections.OrderedDict,
                  load=False,
                  raw=False,
-                 ignore_missing_memofile=False):
+                 ignore_missing_memofile=False,
+                 use_mmap=True,
+                 fields=None,
+                 decode_cache_size=0,
+                 readahead=False,
+                 cache_dir=None):
 
         self.encoding = encoding
         self.ignorecase = ignorecase
@@ -90,6 +115,19 @@ class DBF(object):
         self.parserclass = parserclass
         self.raw = raw
         self.ignore_missing_memofile = ignore_missing_memofile
+        self.use_mmap = use_mmap
+        self.decode_cache_size = decode_cache_size
+        self.readahead = readahead
+        self.cache_dir = cache_dir
+        # Used by the field parser to reuse decoded text values.
+        self._decode_caches = {}
+        self._interned_values = {}
+        # Opened and compiled when records are first read.
+        self._memofile = None
+        self._mapped = None
+        self._field_parser = None
+        self._record_parsers = {}
+        self._record_readers = {}
 
         if recfactory is None:
             self.recfactory = lambda items: items
@@ -101,6 +139,8 @@ class DBF(object):
         self.name = os.path.splitext(self.name)[0].lower()
         self._records = None
         self._deleted = None
+        self._deletion_flags = None
+        self._record_numbers = {}
 
         if ignorecase:
             self.filename = ifind(filename)
@@ -114,6 +154,8 @@ class DBF(object):
         self.header = None
         self.fields = []       # namedtuples
         self.field_names = []  # strings
+        self._field_slices = []  # (field, start, stop) within a record
+        self._selected_fields = None
 
         with open(self.filename, mode='rb') as infile:
             self._read_headers(infile, ignore_missing_memofile)
@@ -129,6 +171,9 @@ class DBF(object):
  
         self.memofilename = self._get_memofilename()
 
+        # Only these fields are decoded and included in records.
+        self._selected_fields = self._get_fields(fields)
+
         if load:
             self.load()
 
@@ -165,8 +210,18 @@ class DBF(object):
 
         """
         if not self.loaded:
-            self._records = list(self._iter_records(b' '))
-            self._deleted = list(self._iter_records(b'*'))
+            flags = bytearray(self._get_deletion_flags())
+            live = ord(b' ')
+            deleted = ord(b'*')
+
+            self._records = []
+            self._deleted = []
+            # Read all records in one pass and sort them by flag.
+            for recno, record in enumerate(self._iter_records(None)):
+                if flags[recno] == live:
+                    self._records.append(record)
+                elif flags[recno] == deleted:
+                    self._deleted.append(record)
 
     def unload(self):
         """Unload records from memory.
@@ -176,6 +231,8 @@ class DBF(object):
         """
         self._records = None
         self._deleted = None
+        self._deletion_flags = None
+        self._record_numbers = {}
 
     @property
     def records(self):
@@ -233,11 +290,57 @@ class DBF(object):
 
             self.fields.append(fh)
 
-    def _open_memofile(self):
-        if self.memofilename and not self.raw:
-            return open_memofile(self.memofilename, self.header.dbversion)
-        else:
-            return FakeMemoFile(self.memofilename)
+        # Offsets of the fields within a record. The first byte
+        # of every record is the deletion flag.
+        start = 1
+        for field in self.fields:
+            self._field_slices.append((field, start, start + field.length))
+            start += field.length
+
+    def _get_memofile(self):
+        """Return the memo file, opened the first time it is needed.
+
+        It is kept open until close() so the parsers made for it can be
+        reused by later scans.
+        """
+        if self._memofile is None:
+            if self.memofilename and not self.raw:
+                self._memofile = open_memofile(self.memofilename,
+                                               self.header.dbversion)
+            else:
+                self._memofile = FakeMemoFile(self.memofilename)
+        return self._memofile
+
+    def _get_field_parser(self):
+        if self._field_parser is None:
+            self._field_parser = self.parserclass(self, self._get_memofile())
+        return self._field_parser
+
+    def _get_mapped_file(self):
+        """Return the table file mapped for random access.
+
+        The mapping is kept open until close(), so reading a single
+        record doesn't map the file again.
+        """
+        if self._mapped is None:
+            self._mapped = MappedFile(self.filename)
+        return self._mapped
+
+    def close(self):
+        """Close the files kept open for reading records and drop the
+        compiled record parsers.
+
+        They are opened and made again if records are read after this.
+        """
+        if self._memofile is not None:
+            self._memofile._close()
+        if self._mapped is not None:
+            self._mapped.close()
+        self._memofile = None
+        self._mapped = None
+        self._field_parser = None
+        self._record_parsers = {}
+        self._record_readers = {}
 
     def _check_headers(self):
 
@@ -258,64 +361,563 @@ class DBF(object):
                 # Todo: return as byte string?
                 raise ValueError('Unknown field type: {!r}'.format(field.type))
 
-    def _skip_record(self, infile):
-        # -1 for the record separator which was already read.
-        infile.seek(self.header.recordlen - 1, 1)
+    def _get_deletion_flags(self):
+        """Return the deletion flags of all records as a byte string.
+
+        The flags are read in a single pass over the file and cached.
+        """
+        if self._deletion_flags is None:
+            headerlen = self.header.headerlen
+            recordlen = self.header.recordlen
+
+            if self.use_mmap:
+                with MappedFile(self.filename) as mapped:
+                    end = self._get_records_end(mapped.size)
+                    flags = mapped.data[headerlen:end:recordlen]
+            else:
+                flags = []
+                with open(self.filename, 'rb') as infile:
+                    infile.seek(headerlen, 0)
+                    while True:
+                        sep = infile.read(1)
+                        if not sep:
+                            break
+                        flags.append(sep)
+                        infile.seek(recordlen - 1, 1)
+                flags = b''.join(flags)
+
+            end_of_records = flags.find(b'\x1a')
+            if end_of_records != -1:
+                flags = flags[:end_of_records]
+
+            self._deletion_flags = flags
+
+        return self._deletion_flags
+
+    def _get_record_numbers(self, record_type=b' '):
+        """Return the physical numbers of all records of this type."""
+        if record_type not in self._record_numbers:
+            code = ord(record_type)
+            flags = bytearray(self._get_deletion_flags())
+            self._record_numbers[record_type] = array.array(
+                'l', (recno for recno, flag in enumerate(flags) if flag == code))
+
+        return self._record_numbers[record_type]
 
     def _count_records(self, record_type=b' '):
-        count = 0
+        return self._get_deletion_flags().count(record_type)
 
-        with open(self.filename, 'rb') as infile:
-            # Skip to first record.
-            infile.seek(self.header.headerlen, 0)
-
-            while True:
-                sep = infile.read(1)
-                if sep == record_type:
-                    count += 1
-                    self._skip_record(infile)
-                elif sep in (b'\x1a', b''):
+    @property
+    def numrecords(self):
+        """Number of records in the table, including deleted ones.
+
+        This is taken from the header when it agrees with the file
+        size, so the file doesn't have to be scanned.
+        """
+        if self._deletion_flags is None:
+            filesize = os.path.getsize(self.filename)
+            end = self._get_records_end(filesize)
+            numrecords = (end - self.header.headerlen) // self.header.recordlen
+            if numrecords == self.header.numrecords:
+                return numrecords
+
+        # The header is inconsistent. Count the records instead.
+        return len(self._get_deletion_flags())
+
+    def _get_records(self, record_type, index):
+        recnos = self._get_record_numbers(record_type)
+        if isinstance(index, slice):
+            return list(self.read_records(recnos[index]))
+        else:
+            return next(self.read_records([recnos[index]]))
+
+    def _iter_records(self, record_type=b' ', start=0, stop=None,
+                      fields=None, predicates=()):
+        fields = self._get_fields(fields)
+
+        if (record_type == b' ' and start == 0 and stop is None and
+                not predicates):
+            columns = self._get_snapshot()
+            if columns is not None:
+                return self._iter_snapshot_records(columns, fields)
+
+        if self.use_mmap and not self.readahead:
+            return self._iter_mapped_records(record_type, start, stop,
+                                             fields, predicates)
+        else:
+            return self._iter_file_records(record_type, start, stop,
+                                           fields, predicates)
+
+    def iter_records(self, start=0, stop=None, record_type=b' ',
+                     fields=None):
+        """Iterate over records starting at a physical record number.
+
+        start and stop are physical record numbers, counting deleted
+        records. Only records of record_type are returned. This can
+        be used to resume a scan or to split a table into ranges.
+
+        fields is an optional list of field names to include in the
+        records. Other fields are skipped without being decoded.
+        """
+        return self._iter_records(record_type, start, stop, fields)
+
+    def filter(self, predicates, fields=None):
+        """Iterate over records that match all the predicates.
+
+        predicates is a list of Equals, In or Between objects. They are
+        checked against the raw record data, so records that don't
+        match are never decoded.
+        """
+        return self._iter_records(fields=fields, predicates=predicates)
+
+    def read_records(self, recnos, fields=None):
+        """Read records by physical record number.
+
+        Returns an iterator over the records in the order given,
+        regardless of their deletion flag.
+        """
+        fields = self._get_fields(fields)
+        headerlen = self.header.headerlen
+        recordlen = self.header.recordlen
+
+        if self.use_mmap:
+            mapped = self._get_mapped_file()
+            data = mapped.data
+            end = self._get_records_end(mapped.size)
+            read_record = self._get_record_reader(fields)
+
+            for recno in recnos:
+                pos = headerlen + recno * recordlen
+                if recno < 0 or pos >= end:
+                    raise IndexError('record number out of range')
+
+                yield read_record(data, pos)
+        else:
+            with open(self.filename, 'rb') as infile:
+                read_record = self._get_record_reader(fields)
+
+                for recno in recnos:
+                    if recno < 0:
+                        raise IndexError('record number out of range')
+                    infile.seek(headerlen + recno * recordlen, 0)
+                    record = infile.read(recordlen)
+                    if len(record) < recordlen:
+                        raise IndexError('record number out of range')
+
+                    yield read_record(record, 0)
+
+    def open_index(self, filename):
+        """Open an index file (.ndx) for the table.
+
+        A relative filename is looked up in the directory of the
+        table, ignoring case if the table was opened with ignorecase.
+        """
+        path = os.path.join(os.path.dirname(self.filename), filename)
+        if self.ignorecase:
+            path = ifind(path)
+        elif not os.path.exists(path):
+            path = None
+
+        if not path:
+            raise MissingIndexFile('could not find index file {!r}'.format(
+                filename))
+
+        return NDXIndex(path, encoding=self.encoding)
+
+    def lookup(self, index, key, fields=None):
+        """Return a list of the records with this key in the index.
+
+        Deleted records are skipped.
+        """
+        flags = self._get_deletion_flags()
+        recnos = [recno for recno in index.lookup(key)
+                  if flags[recno:recno + 1] == b' ']
+        return list(self.read_records(recnos, fields=fields))
+
+    def _get_record_parser(self, fields):
+        """Return the record parser for these fields.
+
+        The parser is compiled the first time a set of fields is read
+        and reused after that.
+        """
+        key = tuple(field.name for field in fields)
+        parser = self._record_parsers.get(key)
+        if parser is None:
+            if self.raw:
+                parser = RecordParser(self, fields=fields)
+            else:
+                parser = RecordParser(self, self._get_field_parser(),
+                                      fields=fields)
+            self._record_parsers[key] = parser
+        return parser
+
+    def _get_record_factory(self, names):
+        """Return a function that makes a record from a list of values."""
+        if self.recfactory is Record:
+            # Records are tuples. There is no need to pair up the names
+            # and values.
+            return make_record_class(names)
+        else:
+            recfactory = self.recfactory
+            return lambda values: recfactory(list(zip(names, values)))
+
+    def _get_record_reader(self, fields):
+        """Return a function that reads the record at an offset in a buffer.
+
+        The buffer can be the mapped file, so records are read without
+        copying them out of it first. Readers are made once for each
+        set of fields.
+        """
+        key = tuple(field.name for field in fields)
+        read_record = self._record_readers.get(key)
+        if read_record is None:
+            read_record = self._make_record_reader(fields)
+            self._record_readers[key] = read_record
+        return read_record
+
+    def _make_record_reader(self, fields):
+        parser = self._get_record_parser(fields)
+
+        if self.recfactory is LazyRecord:
+            recordlen = self.header.recordlen
+            slices = [(start, stop) for field, start, stop
+                      in self._get_field_slices(fields)]
+            make_record = make_lazy_record_class(parser.fields, slices,
+                                                 parser.converters)
+            return lambda data, pos: make_record(
+                bytes(data[pos:pos + recordlen]))
+
+        make_record = self._get_record_factory(parser.names)
+        # Raw values are also taken with unpack(). A memoryview per
+        # field would avoid the copies but costs more than it saves.
+        unpack = parser.unpack
+        return lambda data, pos: make_record(unpack(data, pos))
+
+    def _get_field_slices(self, fields):
+        return [(field, start, stop)
+                for field, start, stop in self._field_slices
+                if field in fields]
+
+    def _get_records_end(self, filesize):
+        """Return the file offset after the last complete record."""
+        numrecords = (filesize - self.header.headerlen) // self.header.recordlen
+        return self.header.headerlen + max(numrecords, 0) * self.header.recordlen
+
+    def _get_matcher(self, predicates):
+        return compile_predicates(self, self._get_field_parser(), predicates)
+
+    def _iter_mapped_records(self, record_type, start, stop, fields,
+                             predicates):
+        with MappedFile(self.filename) as mapped:
+            # Shortcuts for speed.
+            data = mapped.data
+            recordlen = self.header.recordlen
+            read_record = self._get_record_reader(fields)
+            match = self._get_matcher(predicates)
+
+            pos = self.header.headerlen + start * recordlen
+            end = self._get_records_end(mapped.size)
+            if stop is not None:
+                end = min(end, self.header.headerlen + stop * recordlen)
+
+            while pos < end:
+                sep = data[pos:pos + 1]
+
+                if sep == b'\x1a':
                     # End of records.
                     break
-                else:
-                    self._skip_record(infile)
 
-        return count
+                elif ((record_type is None or sep == record_type) and
+                      (match is None or match(data, pos))):
+                    yield read_record(data, pos)
+
+                pos += recordlen
 
-    def _iter_records(self, record_type=b' '):
-        with open(self.filename, 'rb') as infile, \
-             self._open_memofile() as memofile:
+    def _iter_file_records(self, record_type, start, stop, fields,
+                           predicates):
+        recordlen = self.header.recordlen
+        limit = None
+        if stop is not None:
+            limit = max(stop - start, 0) * recordlen
 
+        with open(self.filename, 'rb') as infile:
             # Skip to first record.
-            infile.seek(self.header.headerlen, 0)
+            infile.seek(self.header.headerlen + start * recordlen, 0)
 
-            if not self.raw:
-                field_parser = self.parserclass(self, memofile)
-                parse = field_parser.parse
+            read_record = self._get_record_reader(fields)
+            match = self._get_matcher(predicates)
 
-            # Shortcuts for speed.
-            skip_record = self._skip_record
-            read = infile.read
+            with contextlib.closing(self._read_chunks(infile, limit)) as chunks:
+                for chunk in chunks:
+                    for pos in range(0, len(chunk), recordlen):
+                        sep = chunk[pos:pos + 1]
 
-            while True:
-                sep = read(1)
+                        if sep == b'\x1a' or pos + recordlen > len(chunk):
+                            # End of records.
+                            return
 
-                if sep == record_type:
-                    if self.raw:
-                        items = [(field.name, read(field.length)) \
-                                 for field in self.fields]
-                    else:
-                        items = [(field.name,
-                                  parse(field, read(field.length))) \
-                                 for field in self.fields]
+                        elif ((record_type is None or sep == record_type) and
+                              (match is None or match(chunk, pos))):
+                            yield read_record(chunk, pos)
 
-                    yield self.recfactory(items)
+    def _read_chunks(self, infile, limit=None, size=None):
+        """Yield chunks of whole records from the current file position.
 
-                elif sep in (b'\x1a', b''):
-                    # End of records.
+        The chunks are read in a background thread if readahead is on.
+        """
+        recordlen = self.header.recordlen
+        if size is None:
+            size = max(READ_CHUNK_SIZE // recordlen, 1)
+
+        if self.readahead:
+            return read_ahead(infile, size * recordlen, limit)
+        else:
+            return read_chunks(infile, size * recordlen, limit)
+
+    def _iter_chunks(self, size):
+        """Yield (data, offset, count) for chunks of up to size records.
+
+        data is only valid until the next chunk is requested.
+        """
+        headerlen = self.header.headerlen
+        recordlen = self.header.recordlen
+
+        if self.use_mmap and not self.readahead:
+            with MappedFile(self.filename) as mapped:
+                end = self._get_records_end(mapped.size)
+                for pos in range(headerlen, end, size * recordlen):
+                    count = min(size, (end - pos) // recordlen)
+                    yield mapped.data, pos, count
+        elif self.readahead:
+            with open(self.filename, 'rb') as infile:
+                infile.seek(headerlen, 0)
+                chunks = self._read_chunks(infile, size=size)
+                with contextlib.closing(chunks):
+                    for chunk in chunks:
+                        count = len(chunk) // recordlen
+                        if not count:
+                            break
+                        yield chunk, 0, count
+        else:
+            # One read per chunk into a buffer that is reused.
+            buf = bytearray(size * recordlen)
+            with open(self.filename, 'rb') as infile:
+                infile.seek(headerlen, 0)
+                while True:
+                    count = infile.readinto(buf) // recordlen
+                    if not count:
+                        break
+                    yield buf, 0, count
+
+    def iter_batches(self, size=1000, fields=None, record_type=b' '):
+        """Iterate over records in lists.
+
+        The file is read size records at a time and each list holds
+        the matching records of one such chunk (so it can be shorter
+        than size). With recfactory=Record the lists can be passed
+        directly to sqlite3's executemany().
+
+        Fields are decoded a column at a time for each list.
+        """
+        recordlen = self.header.recordlen
+        fields = self._get_fields(fields)
+
+        if self.recfactory is LazyRecord:
+            read_record = self._get_record_reader(fields)
+
+            def read_batch(data, offsets):
+                return [read_record(data, pos) for pos in offsets]
+        else:
+            parser = self._get_record_parser(fields)
+            unpack_many = parser.unpack_many
+            make_record = self._get_record_factory(parser.names)
+
+            def read_batch(data, offsets):
+                return [make_record(values)
+                        for values in unpack_many(data, offsets)]
+
+        for data, offset, count in self._iter_chunks(size):
+            offsets = []
+            end_of_records = False
+
+            for pos in range(offset, offset + count * recordlen, recordlen):
+                sep = data[pos:pos + 1]
+                if sep == b'\x1a':
+                    end_of_records = True
                     break
-                else:
-                    skip_record(infile)
+                elif sep == record_type:
+                    offsets.append(pos)
+
+            if offsets:
+                yield read_batch(data, offsets)
+
+            if end_of_records:
+                break
+
+    def _iter_record_data(self, record_type=b' '):
+        """Yield the raw bytes of each record (including the flag)."""
+        recordlen = self.header.recordlen
+
+        if self.use_mmap and not self.readahead:
+            with MappedFile(self.filename) as mapped:
+                data = mapped.data
+                pos = self.header.headerlen
+                end = self._get_records_end(mapped.size)
+
+                while pos < end:
+                    sep = data[pos:pos + 1]
+                    if sep == record_type:
+                        yield data[pos:pos + recordlen]
+                    elif sep == b'\x1a':
+                        break
+                    pos += recordlen
+        else:
+            with open(self.filename, 'rb') as infile:
+                infile.seek(self.header.headerlen, 0)
+
+                with contextlib.closing(self._read_chunks(infile)) as chunks:
+                    for chunk in chunks:
+                        for pos in range(0, len(chunk), recordlen):
+                            sep = chunk[pos:pos + 1]
+                            if pos + recordlen > len(chunk) or sep == b'\x1a':
+                                return
+                            elif sep == record_type:
+                                yield chunk[pos:pos + recordlen]
+
+    def _get_fields(self, names):
+        """Return field headers for the given names.
+
+        If names is None the fields selected for the table are returned.
+        """
+        if names is None:
+            if self._selected_fields is None:
+                return list(self.fields)
+            else:
+                return self._selected_fields
+
+        fields_by_name = dict((field.name, field) for field in self.fields)
+        fields = []
+        for name in names:
+            try:
+                fields.append(fields_by_name[name])
+            except KeyError:
+                raise ValueError('Unknown field: {!r}'.format(name))
+        return fields
+
+    def iter_columns(self, fields=None, batch_size=10000):
+        """Iterate over records in batches of columns.
+
+        Yields dictionaries mapping field name to a list of values,
+        one list per field, each with at most batch_size values.
+        The values in a column are decoded together, without building
+        a record object per row.
+        """
+        slices = self._get_field_slices(self._get_fields(fields))
+
+        if self.raw:
+            converters = [None for field, start, stop in slices]
+        else:
+            field_parser = self._get_field_parser()
+            converters = [field_parser.get_column_converter(field)
+                          for field, start, stop in slices]
+        columns = list(zip(slices, converters))
+
+        batch = []
+        for record in self._iter_record_data():
+            batch.append(record)
+            if len(batch) == batch_size:
+                yield self._decode_columns(batch, columns)
+                batch = []
+
+        if batch:
+            yield self._decode_columns(batch, columns)
+
+    def _decode_columns(self, records, columns):
+        decoded = collections.OrderedDict()
+        for (field, start, stop), convert in columns:
+            values = [record[start:stop] for record in records]
+            if convert is None:
+                decoded[field.name] = values
+            else:
+                decoded[field.name] = convert(values)
+        return decoded
+
+    def read_columns(self, fields=None):
+        """Read all records as columns.
+
+        Returns a dictionary mapping field name to a list of values.
+        fields is an optional list of field names to read.
+        """
+        snapshot = self._get_snapshot()
+        if snapshot is not None:
+            return collections.OrderedDict(
+                (field.name, list(snapshot[field.name]))
+                for field in self._get_fields(fields))
+
+        return self._read_columns(fields)
+
+    def _read_columns(self, fields=None):
+        columns = collections.OrderedDict(
+            (field.name, []) for field in self._get_fields(fields))
+
+        for batch in self.iter_columns(fields):
+            for name, values in batch.items():
+                columns[name].extend(values)
+
+        return columns
+
+    def _get_snapshot_signature(self):
+        signature = [SNAPSHOT_VERSION,
+                     sorted(vars(self.header).items()),
+                     self.field_names,
+                     self.encoding,
+                     self.lowernames,
+                     '{}.{}'.format(self.parserclass.__module__,
+                                    self.parserclass.__name__)]
+
+        for filename in [self.filename, self.memofilename]:
+            if filename:
+                stat = os.stat(filename)
+                signature.append((stat.st_size, stat.st_mtime))
+
+        return signature
+
+    def _get_snapshot(self):
+        """Return the decoded columns of all records from the snapshot.
+
+        The snapshot is saved in cache_dir the first time the table is
+        read and used as long as the table file is unchanged. Returns
+        None if snapshots are not used for this table.
+        """
+        if self.cache_dir is None or self.raw or self.recfactory is LazyRecord:
+            return None
+
+        filename = get_cache_filename(self.filename, 'snapshot',
+                                      self.cache_dir)
+        signature = self._get_snapshot_signature()
+
+        saved = load_cache(filename, signature)
+        if saved is not None:
+            return collections.OrderedDict(
+                (name, decode_column(column)) for name, column in saved)
+
+        columns = self._read_columns(self.field_names)
+        try:
+            saved = [(name, encode_column(values))
+                     for name, values in columns.items()]
+        except ValueError:
+            # Memos and values from custom parsers are not saved.
+            pass
+        else:
+            save_cache(filename, signature, saved)
+        return columns
+
+    def _iter_snapshot_records(self, columns, fields):
+        # Records have the fields in table order, as from RecordParser.
+        fields = [field for field in self.fields if field in fields]
+        make_record = self._get_record_factory([field.name for field in fields])
+        for values in zip(*[columns[field.name] for field in fields]):
+            yield make_record(values)
 
     def __iter__(self):
         if self.loaded:
@@ -326,6 +928,9 @@ class DBF(object):
     def __len__(self):
         return len(self.records)
 
+    def __getitem__(self, index):
+        return self.records[index]
+
     def __repr__(self):
         if self.loaded:
             status = 'loaded'
@@ -338,4 +943,5 @@ class DBF(object):
 
     def __exit__(self, type, value, traceback):
         self.unload()
+        self.close()
         return False
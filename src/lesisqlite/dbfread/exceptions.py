@@ -5,5 +5,8 @@ class DBFNotFound(IOError):
 class MissingMemoFile(IOError):
     """Raised if the corresponding memo file was not found."""
 
-__all__ = ['DBFNotFound', 'MissingMemoFile']
+class MissingIndexFile(IOError):
+    """Raised if an index file was not found."""
+
+__all__ = ['DBFNotFound', 'MissingMemoFile', 'MissingIndexFile']
 
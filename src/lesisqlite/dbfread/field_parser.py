@@ -4,8 +4,10 @@ Parser for DBF fields.
 import sys
 import datetime
 import struct
+import functools
 from decimal import Decimal
-from .memo import BinaryMemo
+from .memo import MemoFile, decode_memo
+from .codepages import is_single_byte, decode_text_column
 
 PY2 = sys.version_info[0] == 2
 
@@ -40,22 +42,41 @@ class FieldParser:
         else:
             self.get_memo = lambda x: None
 
-    def _create_lookup_table(self):
-        """Create a lookup table for field types."""
-        lookup = {}
+        if isinstance(memofile, MemoFile):
+            # The memo file caches the decoded memos.
+            self._get_memo_text = memofile.get_text
+        else:
+            self._get_memo_text = lambda index, encoding: decode_memo(
+                self.get_memo(index), encoding)
+
+    @classmethod
+    def _get_parse_method_names(cls):
+        """Return a dict of field type => parse method name.
 
-        for name in dir(self):
-            if name.startswith('parse'):
-                field_type = name[5:]
-                if len(field_type) == 1:
-                    lookup[field_type] = getattr(self, name)
-                elif len(field_type) == 2:
-                    # Hexadecimal ASCII code for field name.
-                    # Example: parse2B() ('+' field)
-                    field_type = chr(int(field_type, 16))
-                    lookup[field_type] = getattr(self, name)
+        The class is only inspected once. Subclasses get their own
+        table.
+        """
+        names = cls.__dict__.get('_parse_method_names')
+        if names is None:
+            names = {}
+            for name in dir(cls):
+                if name.startswith('parse'):
+                    field_type = name[5:]
+                    if len(field_type) == 1:
+                        names[field_type] = name
+                    elif len(field_type) == 2:
+                        # Hexadecimal ASCII code for field name.
+                        # Example: parse2B() ('+' field)
+                        field_type = chr(int(field_type, 16))
+                        names[field_type] = name
+            cls._parse_method_names = names
+
+        return names
 
-        return lookup
+    def _create_lookup_table(self):
+        """Create a lookup table for field types."""
+        return dict((field_type, getattr(self, name)) for field_type, name
+                    in self._get_parse_method_names().items())
 
     def field_type_supported(self, field_type):
         """Checks if the field_type is supported by the parser
@@ -74,6 +95,153 @@ class FieldParser:
         else:
             return func(field, data)
 
+    def get_converter(self, field):
+        """Return a function that parses data for this field
+
+        The type lookup is done once here instead of for every value.
+        """
+        try:
+            func = self._lookup[field.type]
+        except KeyError:
+            raise ValueError('Unknown field type: {!r}'.format(field.type))
+
+        convert = self._get_specialized_converter(field)
+        if convert is None:
+            convert = functools.partial(func, field)
+
+        if field.type == 'C' and getattr(self.table, 'decode_cache_size', 0):
+            convert = self._get_cached_converter(field, convert)
+        return convert
+
+    def _get_specialized_converter(self, field):
+        """Return a parse function made for this field, or None
+
+        These handle the common values of N, D and L fields directly
+        and leave everything else to the parse method. They are only
+        used if the parse method is not overridden.
+        """
+        func = _get_function(self._lookup[field.type])
+        parse = functools.partial(self._lookup[field.type], field)
+
+        if func is _parseN and field.decimal_count == 0:
+            def parse_integer(data):
+                try:
+                    return int(data)
+                except ValueError:
+                    return parse(data)
+            return parse_integer
+
+        elif func is _parseN:
+            # Integral text gives an int, as in parseN().
+            def parse_decimal(data):
+                try:
+                    return int(data)
+                except ValueError:
+                    pass
+                try:
+                    return float(data)
+                except ValueError:
+                    return parse(data)
+            return parse_decimal
+
+        elif func is _parseD:
+            date = datetime.date
+
+            def parse_date(data):
+                try:
+                    return date(int(data[:4]), int(data[4:6]), int(data[6:8]))
+                except ValueError:
+                    return parse(data)
+            return parse_date
+
+        elif func is _parseL:
+            def parse_logical(data):
+                try:
+                    return _logical_values[data]
+                except (KeyError, TypeError):
+                    return parse(data)
+            return parse_logical
+
+        return None
+
+    def _get_cached_converter(self, field, convert):
+        """Wrap convert in a cache of decoded values by raw data
+
+        The caches live in the table, so they are shared by all scans.
+        Each cache holds up to table.decode_cache_size values and is
+        not added to after that. Equal values from all fields are
+        returned as the same string object.
+        """
+        size = self.table.decode_cache_size
+        interned = self.table._interned_values
+        cache = self.table._decode_caches.setdefault(field.name, {})
+
+        def convert_cached(data):
+            try:
+                return cache[data]
+            except KeyError:
+                value = convert(data)
+                if len(cache) < size:
+                    value = interned.setdefault(value, value)
+                    cache[data] = value
+                return value
+
+        return convert_cached
+
+    def _get_cached_column_converter(self, field):
+        """Return a column converter that uses the decode cache
+
+        Values found in the cache are taken from it. The others are
+        decoded in one go and added to the cache as in
+        _get_cached_converter().
+        """
+        size = self.table.decode_cache_size
+        interned = self.table._interned_values
+        cache = self.table._decode_caches.setdefault(field.name, {})
+        encoding = self.encoding
+
+        def convert_column(values):
+            decoded = [cache.get(data) for data in values]
+            missing = [data for data, value in zip(values, decoded)
+                       if value is None]
+            if not missing:
+                return decoded
+
+            new_values = iter(decode_text_column(missing, encoding))
+            for i, value in enumerate(decoded):
+                if value is None:
+                    data = values[i]
+                    value = next(new_values)
+                    if data in cache:
+                        # Repeated in this list.
+                        value = cache[data]
+                    elif len(cache) < size:
+                        value = interned.setdefault(value, value)
+                        cache[data] = value
+                    decoded[i] = value
+            return decoded
+
+        return convert_column
+
+    def get_column_converter(self, field, convert=None):
+        """Return a function that parses a list of values for this field
+
+        Text in a single byte encoding is decoded in one go for the
+        whole list. convert is the converter from get_converter(), if
+        the caller already has it.
+        """
+        if (field.type == 'C'
+                and _get_function(self._lookup['C']) is _parseC
+                and is_single_byte(self.encoding)):
+            if getattr(self.table, 'decode_cache_size', 0):
+                return self._get_cached_column_converter(field)
+            encoding = self.encoding
+            return lambda values: decode_text_column(values, encoding)
+
+        if convert is None:
+            convert = self.get_converter(field)
+        return lambda values: [convert(value) for value in values]
+
     def parse0(self, field, data):
         """Parse flags field and return as byte string"""
         return data
@@ -138,16 +306,10 @@ class FieldParser:
         Returns memo index (an integer), which can be used to look up
         the corresponding memo in the memo file.
         """
-        memo = self.get_memo(self._parse_memo_index(data))
         # Visual FoxPro allows binary data in memo fields.
-        # These should not be decoded as string.
-        if isinstance(memo, BinaryMemo):
-            return memo
-        else:
-            if memo is None:
-                return None
-            else:
-                return memo.decode(self.encoding)
+        # These are not decoded as string.
+        return self._get_memo_text(self._parse_memo_index(data),
+                                   self.encoding)
 
     def parseN(self, field, data):
         """Parse numeric field (N)
@@ -243,3 +405,19 @@ class FieldParser:
 
     # Timestamp field ('@')
     parse40 = parseT
+
+
+def _get_function(method):
+    return getattr(method, '__func__', method)
+
+_parseC = _get_function(FieldParser.parseC)
+_parseD = _get_function(FieldParser.parseD)
+_parseL = _get_function(FieldParser.parseL)
+_parseN = _get_function(FieldParser.parseN)
+
+# Logical field values by raw data, as returned by parseL().
+_logical_values = {
+    b'T': True, b't': True, b'Y': True, b'y': True,
+    b'F': False, b'f': False, b'N': False, b'n': False,
+    b'?': None, b' ': None,
+}
@@ -0,0 +1,113 @@
+"""
+Hash index for one column of a table, kept in a cache file.
+
+The index maps each value of the column to the physical numbers of
+the records that have it. It is built by reading the column once and
+saved, so later runs can look up records without scanning the table:
+
+    >>> table = DBF('n/kl_por.dbf', lowernames=True)
+    >>> index = HashIndex(table, 'kl')
+    >>> list(table.read_records(index.lookup(12)))
+
+A saved index is only used if the table header date, record count and
+file size are the same as when it was built.
+"""
+import os
+
+from .cachefile import (get_cache_filename, get_user_cache_dir,
+                        load_cache, save_cache, encode_column, decode_column)
+
+# Change this if the format of saved indexes changes.
+INDEX_VERSION = 2
+
+
+class HashIndex(object):
+    def __init__(self, table, field_name, cache_dir=None):
+        """Load or build the index for a field of an open table.
+
+        The index is saved in cache_dir, by default a directory in
+        the temporary directory that only the current user can write
+        to. If the index can't be saved it is still built and used in
+        memory.
+        """
+        self.table = table
+        self.field_name = field_name
+        if cache_dir is None:
+            cache_dir = get_user_cache_dir('dbfread')
+
+        if cache_dir is None:
+            self.filename = None
+            saved = None
+        else:
+            self.filename = get_cache_filename(
+                table.filename, '{}.hix'.format(field_name), cache_dir)
+            saved = load_cache(self.filename, self._get_signature())
+
+        if saved is None:
+            self._offsets = self._build()
+            self._save()
+        else:
+            keys, recnos = saved
+            self._offsets = dict(zip(decode_column(keys), recnos))
+
+    def _get_signature(self):
+        header = self.table.header
+        return (INDEX_VERSION,
+                self.field_name,
+                self.table.encoding,
+                (header.year, header.month, header.day),
+                header.numrecords,
+                os.path.getsize(self.table.filename))
+
+    def _build(self):
+        """Map each value to a record number, or a tuple of them
+        if more than one record has the value."""
+        recnos = self.table._get_record_numbers(b' ')
+        values = self.table.read_columns([self.field_name])[self.field_name]
+
+        offsets = {}
+        for recno, value in zip(recnos, values):
+            if value not in offsets:
+                offsets[value] = recno
+            else:
+                found = offsets[value]
+                if isinstance(found, tuple):
+                    offsets[value] = found + (recno,)
+                else:
+                    offsets[value] = (found, recno)
+        return offsets
+
+    def _save(self):
+        # If the index can't be saved it is kept in memory.
+        if self.filename is None:
+            return
+        try:
+            keys = encode_column(list(self._offsets))
+        except ValueError:
+            return
+        save_cache(self.filename, self._get_signature(),
+                   (keys, list(self._offsets.values())))
+
+    def lookup(self, key):
+        """Return a list of the record numbers with this value."""
+        recnos = self._offsets.get(key, ())
+        if isinstance(recnos, tuple):
+            return list(recnos)
+        else:
+            return [recnos]
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def keys(self):
+        return list(self._offsets)
+
+    def __repr__(self):
+        return '<HashIndex {!r} on {!r}>'.format(self.filename,
+                                                 self.field_name)
+
+
+__all__ = ['HashIndex']
@@ -12,6 +12,9 @@ import os
 import glob
 import fnmatch
 
+# Directory listings by directory name: (mtime, {lowercase name: [names]}).
+_listings = {}
+
 
 def ipat(pat):
     """Convert glob pattern to case insensitive form."""
@@ -39,9 +42,52 @@ def ifnmatch(name, pat):
     """Case insensitive version of fnmatch.fnmatch()"""
     return fnmatch.fnmatch(name, ipat(pat))
 
+def _list_dir(dirname):
+    """Return a dict of lowercase file name => list of file names.
+
+    Listings are cached and read again when the directory is modified.
+    """
+    path = dirname or os.curdir
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return {}
+
+    cached = _listings.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        names = os.listdir(path)
+    except OSError:
+        return {}
+
+    index = {}
+    for name in names:
+        index.setdefault(name.lower(), []).append(name)
+    _listings[path] = (mtime, index)
+    return index
+
 def iglob(pat):
     """Case insensitive version of glob.glob()"""
-    return glob.glob(ipat(pat))
+    (dirname, basename) = os.path.split(pat)
+    if glob.has_magic(dirname):
+        return glob.glob(ipat(pat))
+
+    index = _list_dir(dirname)
+    basename = basename.lower()
+    if not glob.has_magic(basename):
+        names = index.get(basename, [])
+    else:
+        names = []
+        for key, keynames in index.items():
+            # glob() skips hidden files unless asked for.
+            if key.startswith('.') and not basename.startswith('.'):
+                continue
+            if fnmatch.fnmatchcase(key, basename):
+                names.extend(keynames)
+
+    return [os.path.join(dirname, name) for name in names]
 
 def ifind(pat, ext=None):
     """Look for a file in a case insensitive way.
@@ -0,0 +1,177 @@
+"""
+Reader for dBase III index files (.ndx).
+
+An index file is a B+ tree of keys and record numbers for one key
+expression. It can be used to find the records for a key without
+reading the whole table, or to read records in key order:
+
+    >>> table = DBF('phl1.dbf')
+    >>> with table.open_index('phl1.ndx') as index:
+    ...     for record in table.lookup(index, '  12    3'):
+    ...         print(record)
+
+Character keys are compared as they are stored, so keys built from
+several fields must be given the way the key expression formats them.
+Numeric and date keys are stored as doubles (dates as Julian day
+numbers).
+
+Record numbers returned by the index are physical record numbers
+starting at 0, which can be passed to DBF.read_records().
+"""
+import datetime
+import struct
+
+from .mapped_file import MappedFile
+from .struct_parser import StructParser
+
+BLOCK_SIZE = 512
+
+# The key expression starts at offset 24, after the unique flag.
+NDXHeader = StructParser(
+    'NDXHeader',
+    '<LLLHHHLBB488s',
+    ['root_block',
+     'num_blocks',
+     'reserved1',
+     'key_length',
+     'max_keys',
+     'numeric',
+     'entry_size',
+     'reserved2',
+     'unique',
+     'key_expression'])
+
+# Child block number and record number in front of each key.
+NDXEntryHeader = struct.Struct('<LL')
+NDXNumericKey = struct.Struct('<d')
+
+# Julian day number of date.fromordinal(0).
+JULIAN_DAY_OFFSET = 1721425
+
+
+class NDXIndex(object):
+    def __init__(self, filename, encoding='ascii'):
+        """Open an index file.
+
+        encoding is used for character keys and should be the
+        encoding of the table.
+        """
+        self.filename = filename
+        self.encoding = encoding
+        self.file = MappedFile(filename)
+        self._data = self.file.data
+
+        self.header = NDXHeader.unpack(self._data[:NDXHeader.struct.size])
+        key_expression = self.header.key_expression.split(b'\0', 1)[0]
+        self.key_expression = key_expression.strip().decode('ascii')
+        self.numeric = bool(self.header.numeric)
+        self.unique = bool(self.header.unique)
+
+    def _read_node(self, block):
+        """Return the list of (child, recno, key) entries in a block.
+
+        Inner nodes have one more entry than they have keys. Its key
+        is None and its child holds the keys above the last key.
+        """
+        data = self._data
+        pos = block * BLOCK_SIZE
+        if block <= 0 or pos + BLOCK_SIZE > len(data):
+            raise ValueError('invalid block number {} in {}'.format(
+                block, self.filename))
+
+        count = struct.unpack('<L', data[pos:pos + 4])[0]
+        key_length = self.header.key_length
+        entry_size = self.header.entry_size
+
+        entries = []
+        pos += 4
+        for i in range(count):
+            child, recno = NDXEntryHeader.unpack_from(data, pos)
+            key = data[pos + 8:pos + 8 + key_length]
+            if self.numeric:
+                key = NDXNumericKey.unpack(key)[0]
+            entries.append((child, recno, key))
+            pos += entry_size
+
+        if entries and entries[0][0]:
+            # Inner node. The last pointer has no key.
+            child = NDXEntryHeader.unpack_from(data, pos)[0]
+            entries.append((child, 0, None))
+
+        return entries
+
+    def _iter_node(self, block, key=None):
+        entries = self._read_node(block)
+        if not entries or not entries[0][0]:
+            # Leaf node.
+            for child, recno, entry_key in entries:
+                if key is None or entry_key >= key:
+                    yield entry_key, recno - 1
+        else:
+            # Each key is the highest key below its child, so the first
+            # child with a key >= key is the first one that can hold it.
+            for child, recno, entry_key in entries:
+                if key is None or entry_key is None or entry_key >= key:
+                    for item in self._iter_node(child, key):
+                        yield item
+
+    def _encode_key(self, key):
+        if self.numeric:
+            if isinstance(key, datetime.date):
+                return float(key.toordinal() + JULIAN_DAY_OFFSET)
+            else:
+                return float(key)
+        else:
+            if not isinstance(key, bytes):
+                key = key.encode(self.encoding)
+            return key.ljust(self.header.key_length, b' ')
+
+    def _decode_key(self, key):
+        if self.numeric:
+            return key
+        else:
+            return key.rstrip(b'\0 ').decode(self.encoding)
+
+    def _iter_from(self, key=None):
+        if self.header.root_block == 0:
+            # Empty index.
+            return iter([])
+        else:
+            return self._iter_node(self.header.root_block, key)
+
+    def items(self):
+        """Yield (key, record number) in key order."""
+        for key, recno in self._iter_from():
+            yield self._decode_key(key), recno
+
+    def __iter__(self):
+        """Yield record numbers in key order."""
+        for key, recno in self._iter_from():
+            yield recno
+
+    def lookup(self, key):
+        """Return a list of the record numbers with this key."""
+        key = self._encode_key(key)
+        recnos = []
+        for entry_key, recno in self._iter_from(key):
+            if entry_key != key:
+                break
+            recnos.append(recno)
+        return recnos
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return '<NDXIndex {!r} on {!r}>'.format(self.filename,
+                                                self.key_expression)
+
+
+__all__ = ['NDXIndex']
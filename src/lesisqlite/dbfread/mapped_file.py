@@ -0,0 +1,33 @@
+"""
+Read-only memory mapped files.
+
+Records are unpacked straight from the mapping, so the file is never
+read into Python byte strings first.
+"""
+import os
+import mmap
+
+
+class MappedFile(object):
+    def __init__(self, filename):
+        self.filename = filename
+
+        with open(filename, 'rb') as infile:
+            self.size = os.fstat(infile.fileno()).st_size
+            if self.size:
+                self.data = mmap.mmap(infile.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+            else:
+                # Empty files can not be mapped.
+                self.data = b''
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+        return False
@@ -8,8 +8,9 @@ VFP == Visual FoxPro
 DB3 == dBase III
 DB4 == dBase IV
 """
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 from .ifiles import ifind
+from .mapped_file import MappedFile
 from .struct_parser import StructParser
 
 
@@ -59,9 +60,22 @@ VFP_TYPE_MAP = {
 }
 
 
+def decode_memo(memo, encoding):
+    """Decode a text memo. Binary memos and None are returned as is."""
+    if memo is None or isinstance(memo, BinaryMemo):
+        return memo
+    else:
+        return memo.decode(encoding)
+
+
 class MemoFile(object):
+    # Number of memos kept in the cache. Raw and decoded memos are
+    # counted separately.
+    cache_size = 1000
+
     def __init__(self, filename):
         self.filename = filename
+        self._cache = OrderedDict()
         self._open()
         self._init()
 
@@ -69,16 +83,47 @@ class MemoFile(object):
         pass
 
     def _open(self):
-        self.file = open(self.filename, 'rb')
-        # Shortcuts for speed.
-        self._read = self.file.read
-        self._seek = self.file.seek
+        self.file = MappedFile(self.filename)
+        # Shortcut for speed.
+        self._data = self.file.data
 
     def _close(self):
         self.file.close()
 
     def __getitem__(self, index):
-        raise NotImplemented
+        """Get a memo from the file."""
+        if index <= 0:
+            return None
+
+        return self._get_cached(index, lambda: self._read_memo(index))
+
+    def get_text(self, index, encoding):
+        """Get a memo from the file decoded with encoding.
+
+        Binary memos are returned as they are. The decoded memo is
+        cached, so it is not decoded again if it is read again.
+        """
+        if index <= 0:
+            return None
+
+        return self._get_cached(
+            (index, encoding),
+            lambda: decode_memo(self._read_memo(index), encoding))
+
+    def _get_cached(self, key, read):
+        try:
+            memo = self._cache.pop(key)
+        except KeyError:
+            memo = read()
+            if len(self._cache) >= self.cache_size:
+                # Drop the least recently used memo.
+                self._cache.popitem(last=False)
+
+        self._cache[key] = memo
+        return memo
+
+    def _read_memo(self, index):
+        raise NotImplementedError
 
     def __enter__(self):
         return self
@@ -92,6 +137,9 @@ class FakeMemoFile(MemoFile):
     def __getitem__(self, i):
         return None
 
+    def get_text(self, i, encoding):
+        return None
+
     def _open(self):
         pass
 
@@ -100,17 +148,16 @@ class FakeMemoFile(MemoFile):
 
 class VFPMemoFile(MemoFile):
     def _init(self):
-        self.header = VFPFileHeader.read(self.file)
+        self.header = VFPFileHeader.unpack(
+            self._data[:VFPFileHeader.struct.size])
 
-    def __getitem__(self, index):
-        """Get a memo from the file."""
-        if index <= 0:
-            return None
-
-        self._seek(index * self.header.blocksize)
-        memo_header = VFPMemoHeader.read(self.file)
+    def _read_memo(self, index):
+        pos = index * self.header.blocksize
+        memo_header = VFPMemoHeader.unpack(
+            self._data[pos:pos + VFPMemoHeader.struct.size])
 
-        data = self._read(memo_header.length)
+        pos += VFPMemoHeader.struct.size
+        data = self._data[pos:pos + memo_header.length]
         if len(data) != memo_header.length:
             raise IOError('EOF reached while reading memo')
         
@@ -119,48 +166,39 @@ class VFPMemoFile(MemoFile):
 
 class DB3MemoFile(MemoFile):
     """dBase III memo file."""
-    # Code from dbf.py
-    def __getitem__(self, index):
-        if index <= 0:
-            return None
-
+    def _read_memo(self, index):
         block_size = 512
-        self._seek(index * block_size)
-        data = ''
-        while True:
-            newdata = self._read(block_size)
-            if not newdata:
-                return data
-            data += newdata
-
-            # Todo: some files (help.dbt) has only one field separator.
-            # Is this enough for all file though?
-            end_of_memo = data.find('\x1a')
-            if end_of_memo != -1:
-                return data[:end_of_memo]
-
-            # Alternative end of memo markers:
-            # '\x1a\x1a'
-            # '\x0d\x0a'
-
-        return data[:eom]        
+        pos = index * block_size
+
+        # Todo: some files (help.dbt) has only one field separator.
+        # Is this enough for all file though?
+        end_of_memo = self._data.find(b'\x1a', pos)
+        if end_of_memo == -1:
+            return self._data[pos:]
+        else:
+            return self._data[pos:end_of_memo]
+
+        # Alternative end of memo markers:
+        # '\x1a\x1a'
+        # '\x0d\x0a'
+
 
 class DB4MemoFile(MemoFile):
     """dBase IV memo file"""
-    def __getitem__(self, index):
-        if index <= 0:
-            return None
-
+    def _read_memo(self, index):
         # Todo: read this from the file header.
         block_size = 512
 
-        self._seek(index * block_size)
-        memo_header = DB4MemoHeader.read(self.file)
-        data = self._read(memo_header.length)
+        pos = index * block_size
+        memo_header = DB4MemoHeader.unpack(
+            self._data[pos:pos + DB4MemoHeader.struct.size])
+
+        pos += DB4MemoHeader.struct.size
+        data = self._data[pos:pos + memo_header.length]
         # Todo: fields are terminated in different ways.
         # \x1a is one of them
         # \x1f seems to be another (dbase_8b.dbt)
-        return data.split('\x1f', 1)[0]
+        return data.split(b'\x1f', 1)[0]
 
 
 def find_memofile(dbf_filename):
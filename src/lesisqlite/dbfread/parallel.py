@@ -0,0 +1,75 @@
+"""
+Read a DBF table in several worker processes.
+
+The table is split into ranges of physical records. Since records have
+a fixed length, every worker can seek directly to its range. Decoded
+ranges are returned in file order as lists of tuples.
+
+Example:
+
+    >>> reader = ParallelReader('phl2.dbf', lowernames=True)
+    >>> for batch in reader:
+    ...     cursor.executemany(sql, batch)
+"""
+import multiprocessing
+
+from .dbf import DBF
+
+# Tables opened by this worker process, by (filename, options).
+_tables = {}
+
+
+def _get_table(filename, options):
+    key = (filename, repr(sorted(options.items())))
+    if key not in _tables:
+        _tables[key] = DBF(filename, **options)
+    return _tables[key]
+
+
+def _read_range(args):
+    filename, options, start, stop = args
+    table = _get_table(filename, options)
+    return [tuple(value for name, value in items)
+            for items in table.iter_records(start, stop)]
+
+
+class ParallelReader(object):
+    def __init__(self, filename, processes=None, chunksize=50000, **options):
+        """Create a parallel reader for a table.
+
+        processes is the number of worker processes (default is the
+        number of CPUs). chunksize is the number of physical records
+        decoded by a worker at a time. Other keyword arguments are
+        passed on to DBF().
+        """
+        options['recfactory'] = None
+        options['load'] = False
+        self.table = DBF(filename, **options)
+        self.processes = processes
+        self.chunksize = chunksize
+        self._options = options
+
+    @property
+    def field_names(self):
+        """Names of the values in each tuple."""
+        return [field.name for field in self.table._get_fields(None)]
+
+    def _get_ranges(self):
+        numrecords = self.table.numrecords
+        for start in range(0, numrecords, self.chunksize):
+            stop = min(start + self.chunksize, numrecords)
+            yield (self.table.filename, self._options, start, stop)
+
+    def __iter__(self):
+        """Yield lists of records (tuples of values) in file order."""
+        pool = multiprocessing.Pool(self.processes)
+        try:
+            for batch in pool.imap(_read_range, self._get_ranges()):
+                yield batch
+        finally:
+            # Also stops the workers if the caller stops early.
+            pool.terminate()
+            pool.join()
+
+
+__all__ = ['ParallelReader']
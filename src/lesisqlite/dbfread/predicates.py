@@ -0,0 +1,219 @@
+"""
+Record filters that are evaluated on raw record data.
+
+The values to look for are encoded the way they are stored in the file,
+so records can be matched by comparing bytes before anything is
+decoded. Only records that match are parsed.
+
+Example:
+
+    >>> table = DBF('phl1.dbf', lowernames=True)
+    >>> for record in table.filter([Equals('nomkvr', 12),
+    ...                             In('nomvyd', [1, 2, 3])]):
+    ...     print(record)
+"""
+import math
+import datetime
+
+
+def _strip(field, data):
+    """Strip padding the same way the field parser does."""
+    if field.type == 'C':
+        return data.rstrip(b'\0 ')
+    else:
+        return data.strip()
+
+
+def encode_value(field, value, encoding):
+    """Return the set of stripped byte strings that decode to value.
+
+    Returns None if the value can't be matched on raw data for this
+    field type.
+    """
+    if value is None:
+        if field.type == 'L':
+            return set([b'?', b''])
+        elif field.type == 'D':
+            return set([b'', b'00000000'])
+        elif field.type == 'C':
+            # Blank text fields are decoded as u'', never as None.
+            return set()
+        elif field.type in 'NF':
+            return set([b''])
+
+    elif field.type == 'C':
+        if not isinstance(value, bytes):
+            value = value.encode(encoding)
+        return set([value.rstrip(b'\0 ')])
+
+    elif field.type in 'NF':
+        if isinstance(value, bool):
+            return None
+        try:
+            if math.isnan(value) or math.isinf(value):
+                return None
+            elif field.decimal_count:
+                text = '{:.{}f}'.format(value, field.decimal_count)
+            elif value == int(value):
+                text = '{}'.format(int(value))
+            else:
+                # Can't be stored in a field without decimals.
+                return set()
+        except (TypeError, ValueError, OverflowError):
+            # Not a number, or too large to compare as a float.
+            return None
+        return set([text.encode('ascii')])
+
+    elif field.type == 'D':
+        if isinstance(value, datetime.date):
+            text = '{:04d}{:02d}{:02d}'.format(value.year,
+                                               value.month,
+                                               value.day)
+            return set([text.encode('ascii')])
+
+    elif field.type == 'L':
+        if value is True:
+            return set([b'T', b't', b'Y', b'y'])
+        elif value is False:
+            return set([b'F', b'f', b'N', b'n'])
+
+    return None
+
+
+class Predicate(object):
+    def __init__(self, name):
+        self.name = name
+
+    def _get_field_slice(self, table):
+        for field, start, stop in table._field_slices:
+            if field.name == self.name:
+                return field, start, stop
+
+        raise ValueError('Unknown field: {!r}'.format(self.name))
+
+    def compile(self, table, field_parser):
+        """Return a function that takes a buffer and the offset of a
+        record in it, and returns True if the record matches."""
+        raise NotImplementedError
+
+
+class In(Predicate):
+    """Field value is one of the values."""
+    def __init__(self, name, values):
+        Predicate.__init__(self, name)
+        self.values = list(values)
+
+    def compile(self, table, field_parser):
+        field, start, stop = self._get_field_slice(table)
+
+        keys = set()
+        for value in self.values:
+            encoded = encode_value(field, value, table.encoding)
+            if encoded is None:
+                break
+            keys.update(encoded)
+        else:
+            # Compare raw bytes.
+            def match(data, pos):
+                return _strip(field, data[pos + start:pos + stop]) in keys
+            return match
+
+        # Decode this field only and compare values.
+        convert = field_parser.get_converter(field)
+        values = self.values
+
+        def match(data, pos):
+            return convert(data[pos + start:pos + stop]) in values
+        return match
+
+    def __repr__(self):
+        return 'In({!r}, {!r})'.format(self.name, self.values)
+
+
+class Equals(In):
+    """Field value is equal to value."""
+    def __init__(self, name, value):
+        In.__init__(self, name, [value])
+
+    def __repr__(self):
+        return 'Equals({!r}, {!r})'.format(self.name, self.values[0])
+
+
+class Between(Predicate):
+    """Field value is in the range [low, high].
+
+    Either bound can be None. Records where the field is empty never
+    match.
+    """
+    def __init__(self, name, low=None, high=None):
+        Predicate.__init__(self, name)
+        self.low = low
+        self.high = high
+
+    def compile(self, table, field_parser):
+        field, start, stop = self._get_field_slice(table)
+        low = self.low
+        high = self.high
+
+        if field.type == 'D':
+            for bound in [low, high]:
+                if not (bound is None or isinstance(bound, datetime.date)):
+                    raise ValueError('bounds for date field {!r} must be '
+                                     'dates (got {!r})'.format(field.name,
+                                                               bound))
+
+            # YYYYMMDD sorts the same way as the dates.
+            low = None if low is None else encode_value(
+                field, low, table.encoding).pop()
+            high = None if high is None else encode_value(
+                field, high, table.encoding).pop()
+
+            def get_value(data, pos):
+                value = data[pos + start:pos + stop].strip()
+                if value.strip(b'0'):
+                    return value
+                else:
+                    return None
+        else:
+            convert = field_parser.get_converter(field)
+
+            def get_value(data, pos):
+                return convert(data[pos + start:pos + stop])
+
+        def match(data, pos):
+            value = get_value(data, pos)
+            if value is None:
+                return False
+            elif low is not None and value < low:
+                return False
+            elif high is not None and value > high:
+                return False
+            else:
+                return True
+
+        return match
+
+    def __repr__(self):
+        return 'Between({!r}, {!r}, {!r})'.format(self.name,
+                                                  self.low, self.high)
+
+
+def compile_predicates(table, field_parser, predicates):
+    """Combine predicates into one function (or None if there are none)."""
+    matchers = [predicate.compile(table, field_parser)
+                for predicate in predicates]
+
+    if not matchers:
+        return None
+    elif len(matchers) == 1:
+        return matchers[0]
+    else:
+        def match(data, pos):
+            for matcher in matchers:
+                if not matcher(data, pos):
+                    return False
+            return True
+        return match
+
+
+__all__ = ['Equals', 'In', 'Between']
@@ -0,0 +1,83 @@
+"""
+Read a file in large chunks, optionally in a background thread.
+
+With read-ahead the next chunks are read while the current one is
+being decoded, which helps when the file is on a slow network share.
+The thread stops when the consumer is done with the generator, also
+if it stops early.
+"""
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+# How often the threads check if the other side has stopped (seconds).
+POLL_INTERVAL = 0.1
+
+
+def read_chunks(infile, size, limit=None):
+    """Yield chunks of up to size bytes from the current position.
+
+    limit is the maximum number of bytes to read.
+    """
+    while limit is None or limit > 0:
+        if limit is not None:
+            size = min(size, limit)
+        data = infile.read(size)
+        if not data:
+            break
+        if limit is not None:
+            limit -= len(data)
+        yield data
+
+
+def read_ahead(infile, size, limit=None, maxchunks=4):
+    """Like read_chunks() but the chunks are read by a background thread.
+
+    At most maxchunks chunks are read ahead of the consumer. Errors
+    in the thread are raised in the consumer.
+    """
+    chunks = queue.Queue(maxchunks)
+    stopped = threading.Event()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                chunks.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                pass
+
+    def reader():
+        try:
+            for data in read_chunks(infile, size, limit):
+                if stopped.is_set():
+                    return
+                put((data, None))
+        except Exception as exception:
+            put((None, exception))
+        else:
+            put((b'', None))
+
+    thread = threading.Thread(target=reader, name='dbfread read-ahead')
+    thread.daemon = True
+    thread.start()
+
+    try:
+        while True:
+            try:
+                # A timeout keeps the wait interruptible on Python 2.
+                data, exception = chunks.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+
+            if exception is not None:
+                raise exception
+            elif not data:
+                break
+            yield data
+    finally:
+        stopped.set()
+        thread.join()
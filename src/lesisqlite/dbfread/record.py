@@ -0,0 +1,220 @@
+"""
+Compact record types.
+
+A record is a tuple of field values. Field names are stored once per
+table in a generated subclass, so a record costs no more memory than a
+tuple. Records can still be used like a dict or with attributes:
+
+    >>> table = DBF('people.dbf', recfactory=Record)
+    >>> record = next(iter(table))
+    >>> record['NAME'], record.NAME, record.get('NAME')
+    (u'Alice', u'Alice', u'Alice')
+
+LazyRecord keeps the raw record data instead and decodes a field the
+first time it is accessed.
+"""
+import sys
+
+PY2 = sys.version_info[0] == 2
+
+if PY2:
+    _positions = (int, long, slice)
+else:
+    _positions = (int, slice)
+
+# Generated record classes by tuple of field names.
+_record_classes = {}
+
+
+class Record(tuple):
+    """Tuple of field values with dict-like access by field name.
+
+    Integers and slices index the values by position. Iterating over a
+    record gives the field names, like iterating over a dict.
+    """
+    __slots__ = ()
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, _positions):
+            return tuple.__getitem__(self, key)
+        else:
+            return tuple.__getitem__(self, self._index[key])
+
+    def __getattr__(self, name):
+        try:
+            return tuple.__getitem__(self, self._index[name])
+        except KeyError:
+            raise AttributeError(name)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def get(self, key, default=None):
+        try:
+            return tuple.__getitem__(self, self._index[key])
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return list(tuple.__iter__(self))
+
+    def items(self):
+        return list(zip(self._fields, tuple.__iter__(self)))
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        elif isinstance(other, Record):
+            return (self._fields == other._fields and
+                    tuple.__eq__(self, other))
+        else:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = tuple.__hash__
+
+    def __reduce__(self):
+        return (_make_record, (self._fields, self.values()))
+
+    def __repr__(self):
+        return 'Record({})'.format(', '.join(
+            '{}={!r}'.format(name, value) for name, value in self.items()))
+
+
+_missing = object()
+
+
+class LazyRecord(object):
+    """Record that decodes each field the first time it is used.
+
+    The raw record data is kept and decoded values are cached. Memo
+    fields are read right away since the memo file is not kept open.
+    """
+    __slots__ = ('_data', '_cache')
+    _fields = ()
+    _index = {}
+    _slices = ()
+    _converters = None
+    _eager = ()
+
+    def __init__(self, data):
+        self._data = data
+        self._cache = [_missing] * len(self._fields)
+        for i in self._eager:
+            self._get(i)
+
+    def _get(self, i):
+        value = self._cache[i]
+        if value is _missing:
+            start, stop = self._slices[i]
+            value = self._data[start:stop]
+            if self._converters is not None:
+                value = self._converters[i](value)
+            self._cache[i] = value
+        return value
+
+    def __getitem__(self, key):
+        return self._get(self._index[key])
+
+    def __getattr__(self, name):
+        try:
+            return self._get(self._index[name])
+        except KeyError:
+            raise AttributeError(name)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def get(self, key, default=None):
+        try:
+            return self._get(self._index[key])
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return [self._get(i) for i in range(len(self._fields))]
+
+    def items(self):
+        return list(zip(self._fields, self.values()))
+
+    def __eq__(self, other):
+        if isinstance(other, (dict, Record, LazyRecord)):
+            return dict(self.items()) == dict(other.items())
+        else:
+            return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'LazyRecord({})'.format(', '.join(
+            '{}={!r}'.format(name, value) for name, value in self.items()))
+
+
+def make_lazy_record_class(fields, slices, converters):
+    """Return a lazy record class for a table.
+
+    fields are the field headers, slices the (start, stop) of each
+    field in the record and converters the parse function for each
+    field (or None for raw values).
+    """
+    field_names = tuple(field.name for field in fields)
+    eager = tuple(i for i, field in enumerate(fields)
+                  if converters is not None and field.type in 'MGPB')
+
+    return type('LazyRecord', (LazyRecord,), {
+        '__slots__': (),
+        '_fields': field_names,
+        '_index': dict((name, i) for i, name in enumerate(field_names)),
+        '_slices': tuple(slices),
+        '_converters': converters,
+        '_eager': eager,
+    })
+
+
+def make_record_class(field_names):
+    """Return the record class for a list of field names."""
+    field_names = tuple(field_names)
+    try:
+        return _record_classes[field_names]
+    except KeyError:
+        index = dict((name, i) for i, name in enumerate(field_names))
+        cls = type('Record', (Record,), {'__slots__': (),
+                                         '_fields': field_names,
+                                         '_index': index})
+        _record_classes[field_names] = cls
+        return cls
+
+
+def _make_record(field_names, values):
+    return make_record_class(field_names)(values)
+
+
+__all__ = ['Record', 'LazyRecord']
@@ -0,0 +1,82 @@
+"""
+Parser for whole DBF records.
+
+The field layout of a table is compiled into a single struct so that a
+record can be split into fields with one unpack_from() call.
+"""
+import struct
+
+
+class RecordParser(object):
+    def __init__(self, table, field_parser=None, fields=None):
+        """Create a record parser for the table.
+
+        If field_parser is None the parser returns the raw field data.
+        fields is an optional list of field headers to parse. The other
+        fields are skipped over by the struct and never decoded.
+        """
+        if fields is None:
+            fields = table.fields
+        self.fields = [field for field in table.fields if field in fields]
+        self.names = tuple(field.name for field in self.fields)
+
+        # The first byte of the record is the deletion flag.
+        format = '<'
+        skip = 1
+        for field in table.fields:
+            if field in fields:
+                if skip:
+                    format += '{}x'.format(skip)
+                    skip = 0
+                format += '{}s'.format(field.length)
+            else:
+                skip += field.length
+
+        padding = table.header.recordlen - struct.calcsize(format)
+        if padding > 0:
+            format += '{}x'.format(padding)
+        self.struct = struct.Struct(format)
+        self.size = self.struct.size
+
+        self._field_parser = field_parser
+        self._column_converters = None
+        if field_parser is None:
+            self.converters = None
+        else:
+            self.converters = tuple(field_parser.get_converter(field)
+                                    for field in self.fields)
+
+    @property
+    def column_converters(self):
+        """Converters for lists of values, made when first needed."""
+        if (self._column_converters is None
+                and self._field_parser is not None):
+            self._column_converters = tuple(
+                self._field_parser.get_column_converter(field, convert)
+                for field, convert in zip(self.fields, self.converters))
+        return self._column_converters
+
+    def unpack(self, data, offset=0):
+        """Return a list of field values for the record at offset."""
+        values = self.struct.unpack_from(data, offset)
+        if self.converters is None:
+            return list(values)
+        else:
+            return [convert(value) for convert, value
+                    in zip(self.converters, values)]
+
+    def unpack_many(self, data, offsets):
+        """Return a list of value tuples for the records at offsets.
+
+        The values are parsed column by column, so each field's
+        converter is called once for the whole list.
+        """
+        unpack_from = self.struct.unpack_from
+        rows = [unpack_from(data, offset) for offset in offsets]
+        column_converters = self.column_converters
+        if column_converters is None or not rows:
+            return rows
+
+        columns = [convert(list(values)) for convert, values
+                   in zip(column_converters, zip(*rows))]
+        return list(zip(*columns))
@@ -0,0 +1,31 @@
+from .dbf import DBF
+from .record import Record
+from .conftest import people
+
+def test_batches(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, use_mmap=use_mmap)
+        assert list(table.iter_batches(10)) == [people]
+        # The deleted record is in the first chunk of two.
+        assert list(table.iter_batches(2)) == [people[:1], people[1:]]
+
+def test_batch_values(people_dbf):
+    table = DBF(people_dbf, recfactory=Record)
+    batch, = table.iter_batches(fields=['NAME', 'KIDS'])
+    assert [tuple(record.values()) for record in batch] == \
+        [(u'Alice', 2), (u'Bob', None)]
+
+def test_record_parser_reused(people_dbf):
+    table = DBF(people_dbf)
+    list(table)
+    list(table.iter_records(1))
+    parser, = table._record_parsers.values()
+    # Column converters are only made for batches.
+    assert parser._column_converters is None
+    list(table.iter_batches())
+    assert table._record_parsers == {tuple(table.field_names): parser}
+    assert parser._column_converters is not None
+
+    table.close()
+    assert table._record_parsers == {}
+    assert list(table) == people
@@ -0,0 +1,48 @@
+import os
+import datetime
+from decimal import Decimal
+from pytest import raises
+from .cachefile import (load_cache, save_cache, get_user_cache_dir,
+                        encode_column, decode_column)
+from .conftest import temp_directory
+
+
+def test_encode_column():
+    columns = [[u'Alice', None, 2, 1.5, True],
+               [datetime.date(2015, 3, 1), None],
+               [datetime.datetime(2015, 3, 1, 12, 30, 5, 10), None],
+               [Decimal('1.10'), None]]
+    for values in columns:
+        assert decode_column(encode_column(values)) == values
+
+    with raises(ValueError):
+        encode_column([datetime.date(2015, 3, 1), 1])
+
+
+def test_load_cache(tmpdir):
+    filename = os.path.join(str(tmpdir), 'cache', 'people.dbf.snapshot')
+    assert save_cache(filename, [1, (2, u'x')], {u'NAME': [u'Alice']})
+    assert load_cache(filename, [1, (2, u'x')]) == {u'NAME': [u'Alice']}
+    assert load_cache(filename, [2]) is None
+
+    # Values marshal can't store are not saved.
+    assert not save_cache(filename, [1], [object()])
+    assert os.listdir(os.path.dirname(filename)) == ['people.dbf.snapshot']
+
+    if hasattr(os, 'getuid'):
+        # Files other users can replace are not loaded.
+        os.chmod(filename, 0o666)
+        assert load_cache(filename, [1, (2, u'x')]) is None
+
+
+def test_user_cache_dir(tmpdir):
+    with temp_directory(tmpdir):
+        dirname = get_user_cache_dir('dbfread-test')
+        assert os.path.dirname(dirname) == str(tmpdir)
+        assert os.path.isdir(dirname)
+        assert get_user_cache_dir('dbfread-test') == dirname
+
+        if hasattr(os, 'getuid'):
+            # Not used if others can write to it.
+            os.chmod(dirname, 0o777)
+            assert get_user_cache_dir('dbfread-test') is None
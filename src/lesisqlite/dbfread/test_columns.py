@@ -0,0 +1,24 @@
+import datetime
+from pytest import raises
+from .dbf import DBF
+from .conftest import people
+
+def test_read_columns(people_dbf):
+    columns = DBF(people_dbf).read_columns()
+    assert list(columns) == [u'NAME', u'BIRTHDATE', u'KIDS', u'HEIGHT',
+                             u'MARRIED']
+    for name, values in columns.items():
+        assert values == [record[name] for record in people]
+
+def test_read_some_columns(people_dbf):
+    columns = DBF(people_dbf, use_mmap=False).read_columns(['KIDS', 'NAME'])
+    assert list(columns) == [u'KIDS', u'NAME']
+    assert columns[u'NAME'] == [u'Alice', u'Bob']
+
+    with raises(ValueError):
+        DBF(people_dbf).read_columns(['MISSING'])
+
+def test_iter_columns(people_dbf):
+    batches = list(DBF(people_dbf).iter_columns(['BIRTHDATE'], batch_size=1))
+    assert batches == [{u'BIRTHDATE': [datetime.date(1987, 3, 1)]},
+                       {u'BIRTHDATE': [datetime.date(1980, 11, 12)]}]
@@ -1,3 +1,4 @@
+# -*- coding: utf-8 -*-
 import datetime
 from decimal import Decimal
 from pytest import raises
@@ -169,3 +170,98 @@ def test_hex_field():
     field = MockField('?')
 
     parser.parse(field, b'test')
+
+def test_C_decode_cache():
+    dbf = MockDBF()
+    dbf.decode_cache_size = 2
+    dbf._decode_caches = {}
+    dbf._interned_values = {}
+    parser = FieldParser(dbf)
+    convert = parser.get_converter(MockField('C', name='A'))
+    other = parser.get_converter(MockField('C', name='B'))
+
+    first = convert(b'pine  ')
+    assert first == u'pine'
+    assert convert(b'pine  ') is first
+    # Equal values from other fields are shared.
+    assert other(b'pine') is first
+
+    convert(b'oak')
+    # The cache is full. Values are still decoded.
+    assert convert(b'birch') == u'birch'
+    assert len(dbf._decode_caches['A']) == 2
+
+def test_C_column():
+    dbf = MockDBF()
+    dbf.encoding = 'cp866'
+    parser = FieldParser(dbf)
+    convert = parser.get_column_converter(MockField('C'))
+    values = [u'сосна '.encode('cp866'), b'el\0\0\0\0']
+    assert convert(values) == [u'сосна', u'el']
+    assert convert([]) == []
+
+def test_C_column_decode_cache():
+    dbf = MockDBF()
+    dbf.encoding = 'cp866'
+    dbf.decode_cache_size = 2
+    dbf._decode_caches = {}
+    dbf._interned_values = {}
+    parser = FieldParser(dbf)
+    convert = parser.get_column_converter(MockField('C', name='A'))
+    other = parser.get_converter(MockField('C', name='B'))
+
+    first = convert([b'pine', b'oak ', b'pine'])
+    assert first == [u'pine', u'oak', u'pine']
+    assert first[2] is first[0]
+    # Shared with the record by record converters.
+    assert other(b'oak') is first[1]
+
+    # The cache is full. Values are still decoded.
+    assert convert([b'elm ', b'pine']) == [u'elm', u'pine']
+    assert convert([b'elm ', b'oak ']) == [u'elm', u'oak']
+    assert len(dbf._decode_caches['A']) == 2
+
+def test_is_single_byte():
+    from .codepages import is_single_byte
+    assert is_single_byte('cp866')
+    assert not is_single_byte('ascii')
+    assert not is_single_byte('cp932')
+
+def test_specialized_converters():
+    parser = FieldParser(MockDBF())
+    samples = {
+        ('N', 0): [b'  12', b'-3', b'', b'   ', b'3.5', b'1,5'],
+        ('N', 2): [b'  1.68', b'-0.50', b'', b'1,5', b'   2'],
+        ('D', 0): [b'20160131', b'00000000', b'        '],
+        ('L', 0): [b'T', b'n', b'?', b' '],
+    }
+    for (field_type, decimal_count), values in samples.items():
+        field = MockField(field_type, decimal_count=decimal_count)
+        convert = parser.get_converter(field)
+        assert not hasattr(convert, 'func')
+        for value in values:
+            assert convert(value) == parser.parse(field, value)
+
+    # Integral text in decimal fields gives ints, as in parseN().
+    convert = parser.get_converter(MockField('N', decimal_count=2))
+    assert isinstance(convert(b'2'), int)
+    assert isinstance(convert(b'2.00'), float)
+
+    for field_type, value in [('N', b'abc'), ('D', b'2016013x'), ('L', b'!')]:
+        convert = parser.get_converter(MockField(field_type, decimal_count=0))
+        with raises(ValueError):
+            convert(value)
+
+def test_lookup_table_per_class():
+    class MyFieldParser(FieldParser):
+        def parseN(self, field, data):
+            return u'number'
+
+    assert 'N' in FieldParser._get_parse_method_names()
+    assert FieldParser._get_parse_method_names() is \
+        FieldParser._get_parse_method_names()
+
+    # Overridden parse methods are used instead of the fast converters.
+    parser = MyFieldParser(MockDBF())
+    convert = parser.get_converter(MockField('N', decimal_count=0))
+    assert convert(b'12') == u'number'
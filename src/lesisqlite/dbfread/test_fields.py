@@ -0,0 +1,29 @@
+from pytest import raises
+from .dbf import DBF
+from .conftest import people
+
+def project(records, names):
+    return [dict((name, record[name]) for name in names)
+            for record in records]
+
+def test_table_fields(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, fields=['KIDS', 'NAME'], use_mmap=use_mmap)
+        records = list(table)
+        assert records == project(people, ['NAME', 'KIDS'])
+        # Fields keep the order they have in the table.
+        assert list(records[0]) == ['NAME', 'KIDS']
+        assert table[1] == project(people, ['NAME', 'KIDS'])[1]
+
+def test_iter_records_fields(people_dbf):
+    table = DBF(people_dbf)
+    assert list(table.iter_records(fields=['MARRIED'])) == \
+        project(people, ['MARRIED'])
+
+def test_raw_fields(people_dbf):
+    table = DBF(people_dbf, raw=True, fields=['HEIGHT'])
+    assert [bytes(record['HEIGHT']) for record in table] == [b'  1.68', b'      ']
+
+def test_unknown_field(people_dbf):
+    with raises(ValueError):
+        DBF(people_dbf, fields=['MISSING'])
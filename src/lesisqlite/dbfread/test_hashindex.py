@@ -0,0 +1,51 @@
+import os
+from .dbf import DBF
+from .hashindex import HashIndex
+from .cachefile import get_user_cache_dir
+from .conftest import (write_dbf, temp_directory, people, PEOPLE_FIELDS,
+                       PEOPLE_RECORDS)
+
+
+def test_lookup(people_dbf):
+    table = DBF(people_dbf)
+    with temp_directory(os.path.dirname(people_dbf)):
+        index = HashIndex(table, 'NAME')
+        cache_dir = get_user_cache_dir('dbfread')
+    assert index.lookup(u'Bob') == [2]
+    assert list(table.read_records(index.lookup(u'Alice'))) == people[:1]
+    # Deleted records are not indexed.
+    assert u'Deleted Guy' not in index
+    assert index.lookup(u'Nobody') == []
+    # Saved in the private cache directory, not next to the table.
+    assert os.path.exists(index.filename)
+    assert os.path.dirname(index.filename) == cache_dir
+
+
+def test_duplicate_keys(tmpdir):
+    filename = write_dbf(tmpdir.join('kids.dbf'), PEOPLE_FIELDS,
+                         PEOPLE_RECORDS + PEOPLE_RECORDS)
+    index = HashIndex(DBF(filename), 'KIDS',
+                      cache_dir=os.path.join(str(tmpdir), 'cache'))
+    assert index.lookup(2) == [0, 3]
+    assert index.lookup(None) == [2, 5]
+
+
+def test_saved_index(tmpdir):
+    filename = write_dbf(tmpdir.join('people.dbf'), PEOPLE_FIELDS,
+                         PEOPLE_RECORDS)
+    cache_dir = os.path.join(str(tmpdir), 'cache')
+    index = HashIndex(DBF(filename), 'NAME', cache_dir=cache_dir)
+    assert os.path.dirname(index.filename) == cache_dir
+
+    # Reused while the table is the same.
+    index._offsets[u'Carol'] = 5
+    index._save()
+    assert HashIndex(DBF(filename), 'NAME',
+                     cache_dir=cache_dir).lookup(u'Carol') == [5]
+
+    # Rebuilt when the table changes.
+    write_dbf(filename, PEOPLE_FIELDS, PEOPLE_RECORDS[:1])
+    index = HashIndex(DBF(filename), 'NAME', cache_dir=cache_dir)
+    assert u'Carol' not in index
+    assert u'Bob' not in index
+    assert index.lookup(u'Alice') == [0]
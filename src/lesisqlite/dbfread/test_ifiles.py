@@ -1,3 +1,4 @@
+import os
 from .ifiles import *
 from .ifiles import ipat
 
@@ -9,3 +10,29 @@ assert ifnmatch('CAMELCASE/CamelCase', 'CamelCase/UPPERCASE') == False
 # Pattern with 
 # assert ipat('[A]') == '[[Aa]]'
 
+
+
+def test_ifind(tmpdir):
+    dirname = str(tmpdir)
+    for name in ['Table.DBF', 'table.fpt']:
+        open(os.path.join(dirname, name), 'w').close()
+
+    assert ifind(os.path.join(dirname, 'TABLE.dbf')) == \
+        os.path.join(dirname, 'Table.DBF')
+    assert ifind(os.path.join(dirname, 'table.dbf'), ext='.FPT') == \
+        os.path.join(dirname, 'table.fpt')
+    assert ifind(os.path.join(dirname, 'table.dbt')) is None
+    assert sorted(iglob(os.path.join(dirname, 'TABLE.*'))) == [
+        os.path.join(dirname, 'Table.DBF'),
+        os.path.join(dirname, 'table.fpt')]
+
+
+def test_ifind_new_file(tmpdir):
+    dirname = str(tmpdir)
+    assert ifind(os.path.join(dirname, 'new.dbf')) is None
+
+    open(os.path.join(dirname, 'NEW.DBF'), 'w').close()
+    # Make sure the directory looks modified.
+    os.utime(dirname, (0, 0))
+    assert ifind(os.path.join(dirname, 'new.dbf')) == \
+        os.path.join(dirname, 'NEW.DBF')
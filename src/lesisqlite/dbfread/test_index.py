@@ -0,0 +1,117 @@
+import os
+import struct
+import datetime
+from pytest import raises
+from .dbf import DBF
+from .index import NDXIndex, JULIAN_DAY_OFFSET
+from .exceptions import MissingIndexFile
+from .conftest import people, deleted_people
+
+
+def write_ndx(filename, entries, key_length, numeric=False, per_leaf=2):
+    """Write a dBase III index with one level of inner nodes.
+
+    entries is a sorted list of (key, recno) with recno starting at 1.
+    """
+    entry_size = (8 + key_length + 3) // 4 * 4
+    if numeric:
+        pack_key = lambda key: struct.pack('<d', key)
+    else:
+        pack_key = lambda key: key.ljust(key_length)
+
+    def write_node(outfile, items, last_child=None):
+        block = struct.pack('<L', len(items))
+        for child, recno, key in items:
+            block += struct.pack('<LL', child, recno)
+            block += pack_key(key).ljust(entry_size - 8, b'\0')
+        if last_child is not None:
+            block += struct.pack('<LL', last_child, 0)
+        outfile.write(block.ljust(512, b'\0'))
+
+    leaves = [entries[i:i + per_leaf]
+              for i in range(0, len(entries), per_leaf)]
+    root = len(leaves) + 1
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(struct.pack('<LLLHHHLBB488s',
+                                  root, root + 1, 0,
+                                  key_length, per_leaf, int(numeric),
+                                  entry_size, 0, 0, b'NAME'))
+        for leaf in leaves:
+            write_node(outfile, [(0, recno, key) for key, recno in leaf])
+        write_node(outfile,
+                   [(i + 1, 0, leaf[-1][0])
+                    for i, leaf in enumerate(leaves[:-1])],
+                   last_child=len(leaves))
+
+    return filename
+
+
+def test_ndx_index(people_dbf):
+    filename = os.path.join(os.path.dirname(people_dbf), 'names.ndx')
+    write_ndx(filename, [(b'Alice', 1), (b'Bob', 3), (b'Bob', 4),
+                         (b'Carol', 5), (b'Deleted Guy', 2)], 16)
+
+    with NDXIndex(filename) as index:
+        assert index.key_expression == 'NAME'
+        assert not index.numeric
+        assert list(index) == [0, 2, 3, 4, 1]
+        assert list(index.items())[:2] == [(u'Alice', 0), (u'Bob', 2)]
+        assert index.lookup(u'Bob') == [2, 3]
+        assert index.lookup(b'Carol') == [4]
+        assert index.lookup(u'Ann') == []
+        assert index.lookup(u'Zed') == []
+
+
+def test_ndx_header(tmpdir):
+    filename = str(tmpdir.join('unique.ndx'))
+    header = bytearray(512)
+    header[0:4] = struct.pack('<L', 1)     # Root block.
+    header[4:8] = struct.pack('<L', 2)     # Number of blocks.
+    header[12:14] = struct.pack('<H', 4)   # Key length.
+    header[14:16] = struct.pack('<H', 1)   # Keys per block.
+    header[18:22] = struct.pack('<L', 12)  # Key entry size.
+    header[23] = 1                         # Unique.
+    header[24:28] = b'KL\0\0'
+    leaf = struct.pack('<LLL4s', 1, 0, 7, b'AB  ')
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(bytes(header))
+        outfile.write(leaf.ljust(512, b'\0'))
+
+    with NDXIndex(filename) as index:
+        assert index.unique
+        assert index.key_expression == 'KL'
+        assert index.header.entry_size == 12
+        assert index.lookup(u'AB') == [6]
+
+
+def test_ndx_numeric_keys(tmpdir):
+    filename = str(tmpdir.join('dates.ndx'))
+    day = datetime.date(1980, 11, 12)
+    julian_day = float(day.toordinal() + JULIAN_DAY_OFFSET)
+    write_ndx(filename, [(-1.5, 3), (2.0, 1), (julian_day, 2)], 8,
+              numeric=True)
+
+    with NDXIndex(filename) as index:
+        assert index.numeric
+        assert index.lookup(2) == [0]
+        assert index.lookup(-1.5) == [2]
+        assert index.lookup(day) == [1]
+        assert index.lookup(3) == []
+
+
+def test_table_lookup(people_dbf):
+    write_ndx(os.path.join(os.path.dirname(people_dbf), 'NAMES.NDX'),
+              [(b'Alice', 1), (b'Bob', 3), (b'Deleted Guy', 2)], 16)
+
+    table = DBF(people_dbf)
+    with table.open_index('names.ndx') as index:
+        assert table.lookup(index, u'Bob') == people[1:]
+        # Deleted records are skipped.
+        assert table.lookup(index, u'Deleted Guy') == []
+        assert list(table.read_records(index)) == [people[0], people[1],
+                                                   deleted_people[0]]
+
+    with raises(MissingIndexFile):
+        table.open_index('missing.ndx')
@@ -0,0 +1,20 @@
+from .dbf import DBF
+from .conftest import people, deleted_people
+
+def test_mapped_records(people_dbf):
+    table = DBF(people_dbf)
+    assert list(table) == people
+    assert list(table.deleted) == deleted_people
+
+def test_mapped_and_file_records_are_equal(people_dbf):
+    mapped = DBF(people_dbf)
+    unmapped = DBF(people_dbf, use_mmap=False)
+    assert list(mapped) == list(unmapped)
+    assert list(mapped.deleted) == list(unmapped.deleted)
+
+def test_raw_records(people_dbf):
+    record = next(iter(DBF(people_dbf, raw=True)))
+    assert record['NAME'].rstrip() == b'Alice'
+    assert record['KIDS'] == b'  2'
+    assert list(DBF(people_dbf, raw=True)) == \
+        list(DBF(people_dbf, raw=True, use_mmap=False))
@@ -1,6 +1,8 @@
 from pytest import raises
 from .dbf import DBF
 from .exceptions import MissingMemoFile
+from .memo import (DB3MemoFile, VFPMemoFile, VFPFileHeader, VFPMemoHeader,
+                   TextMemo)
 
 def test_missing_memofile():
     with raises(MissingMemoFile):
@@ -12,3 +14,52 @@ def test_missing_memofile():
     # Memo fields should be returned as None.
     record = next(iter(table))
     assert record['MEMO'] is None
+
+
+def test_db3_memofile(tmpdir):
+    filename = str(tmpdir.join('memo.dbt'))
+    with open(filename, 'wb') as outfile:
+        outfile.write(b'\0' * 512)
+        outfile.write(b'first memo\x1a\x1a'.ljust(512, b'\0'))
+        outfile.write(b'x' * 600 + b'\x1a')
+        outfile.write(b'\0' * 423)
+        outfile.write(b'no end marker')
+
+    with DB3MemoFile(filename) as memofile:
+        assert memofile[0] is None
+        assert memofile[1] == b'first memo'
+        assert memofile[2] == b'x' * 600
+        assert memofile[4] == b'no end marker'
+
+
+def test_vfp_memofile(tmpdir):
+    filename = str(tmpdir.join('memo.fpt'))
+    with open(filename, 'wb') as outfile:
+        outfile.write(VFPFileHeader.struct.pack(9, 0, 64, b''))
+        outfile.write(VFPMemoHeader.struct.pack(1, 5) + b'hello')
+
+    with VFPMemoFile(filename) as memofile:
+        assert memofile[8] == b'hello'
+        assert isinstance(memofile[8], TextMemo)
+
+
+def test_memo_cache(tmpdir):
+    filename = str(tmpdir.join('memo.dbt'))
+    with open(filename, 'wb') as outfile:
+        for i in range(4):
+            outfile.write('memo {}\x1a'.format(i).encode('ascii')
+                          .ljust(512, b'\0'))
+
+    with DB3MemoFile(filename) as memofile:
+        memofile.cache_size = 2
+        assert memofile[1] == b'memo 1'
+        assert memofile[2] == b'memo 2'
+        assert memofile[1] == b'memo 1'
+        assert memofile[3] == b'memo 3'
+        # Memo 2 was the least recently used.
+        assert list(memofile._cache) == [1, 3]
+
+        # Decoded memos are cached too.
+        assert memofile.get_text(3, 'ascii') == u'memo 3'
+        assert memofile.get_text(3, 'ascii') is memofile.get_text(3, 'ascii')
+        assert list(memofile._cache) == [3, (3, 'ascii')]
@@ -0,0 +1,21 @@
+from .parallel import ParallelReader
+from .conftest import people
+
+def test_parallel_reader(people_dbf):
+    reader = ParallelReader(people_dbf, processes=2, chunksize=1)
+    names = reader.field_names
+    batches = list(reader)
+    # One batch per physical record, including the deleted one.
+    assert len(batches) == 3
+    records = [dict(zip(names, values))
+               for batch in batches for values in batch]
+    assert records == people
+
+def test_parallel_reader_fields(people_dbf):
+    reader = ParallelReader(people_dbf, fields=['NAME'])
+    assert reader.field_names == ['NAME']
+    assert list(reader) == [[(u'Alice',), (u'Bob',)]]
+
+def test_parallel_reader_raw(people_dbf):
+    reader = ParallelReader(people_dbf, fields=['KIDS'], raw=True)
+    assert list(reader) == [[(b'  2',), (b'   ',)]]
@@ -0,0 +1,54 @@
+import datetime
+from pytest import raises
+from .dbf import DBF
+from .predicates import Equals, In, Between
+from .conftest import people
+
+alice, bob = people
+
+def test_equals(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, use_mmap=use_mmap)
+        assert list(table.filter([Equals('NAME', u'Bob')])) == [bob]
+        assert list(table.filter([Equals('KIDS', 2)])) == [alice]
+        assert list(table.filter([Equals('KIDS', None)])) == [bob]
+        assert list(table.filter([Equals('HEIGHT', 1.68)])) == [alice]
+        assert list(table.filter([Equals('MARRIED', True)])) == [alice]
+        assert list(table.filter([Equals('MARRIED', None)])) == [bob]
+        assert list(table.filter([Equals('BIRTHDATE',
+                                         datetime.date(1980, 11, 12))])) \
+            == [bob]
+
+def test_equals_fallback(people_dbf):
+    table = DBF(people_dbf)
+    # Blank text fields are u'', not None.
+    assert list(table.filter([Equals('NAME', None)])) == []
+    # Values that can't be encoded for the field are compared decoded.
+    assert list(table.filter([Equals('KIDS', 'two')])) == []
+    assert list(table.filter([Equals('HEIGHT', float('nan'))])) == []
+    assert list(table.filter([In('KIDS', [10 ** 400, 2])])) == [alice]
+
+def test_in(people_dbf):
+    table = DBF(people_dbf)
+    assert list(table.filter([In('NAME', [u'Alice', u'Bob'])])) == people
+    # Deleted records are not returned.
+    assert list(table.filter([In('NAME', [u'Deleted Guy'])])) == []
+
+def test_between(people_dbf):
+    table = DBF(people_dbf)
+    assert list(table.filter([Between('KIDS', 1, 5)])) == [alice]
+    assert list(table.filter([Between('BIRTHDATE',
+                                      high=datetime.date(1985, 1, 1))])) \
+        == [bob]
+    with raises(ValueError):
+        list(table.filter([Between('BIRTHDATE', low='1985')]))
+
+def test_combined(people_dbf):
+    table = DBF(people_dbf)
+    predicates = [In('NAME', [u'Alice', u'Bob']), Between('HEIGHT', low=1.5)]
+    assert list(table.filter(predicates, fields=['NAME'])) == \
+        [{u'NAME': u'Alice'}]
+
+def test_unknown_field(people_dbf):
+    with raises(ValueError):
+        list(DBF(people_dbf).filter([Equals('MISSING', 1)]))
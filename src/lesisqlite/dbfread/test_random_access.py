@@ -0,0 +1,63 @@
+from pytest import raises
+from .dbf import DBF
+from .conftest import people, deleted_people
+
+def test_index(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, use_mmap=use_mmap)
+        assert table[0] == people[0]
+        assert table[-1] == people[-1]
+        assert table.deleted[0] == deleted_people[0]
+        with raises(IndexError):
+            table[2]
+
+def test_index_reuses_mapping(people_dbf):
+    with DBF(people_dbf) as table:
+        assert table[0] == people[0]
+        mapped = table._mapped
+        assert table[1] == people[1]
+        assert table._mapped is mapped
+    # Closed at the end of the with block.
+    assert table._mapped is None
+    assert table[0] == people[0]
+
+def test_slice(people_dbf):
+    table = DBF(people_dbf)
+    assert table[0:2] == people
+    assert table[1:] == people[1:]
+    assert table.records[::-1] == people[::-1]
+
+def test_loaded_index(people_dbf):
+    table = DBF(people_dbf, load=True)
+    assert table[1] == people[1]
+    assert table.deleted == deleted_people
+
+def test_iter_records_from_offset(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, use_mmap=use_mmap)
+        # Record 1 is deleted.
+        assert list(table.iter_records(1)) == people[1:]
+        assert list(table.iter_records(0, 2)) == people[:1]
+        assert list(table.iter_records(1, record_type=b'*')) == deleted_people
+
+def test_read_records(people_dbf):
+    table = DBF(people_dbf)
+    assert list(table.read_records([2, 1, 0])) == \
+        [people[1], deleted_people[0], people[0]]
+    with raises(IndexError):
+        list(table.read_records([3]))
+
+def test_deletion_flags(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, use_mmap=use_mmap)
+        assert table._get_deletion_flags() == b' * '
+        assert len(table) == 2
+        assert len(table.deleted) == 1
+
+def test_numrecords(people_dbf):
+    assert DBF(people_dbf).numrecords == 3
+
+def test_numrecords_inconsistent_header(people_dbf):
+    table = DBF(people_dbf)
+    table.header.numrecords = 10
+    assert table.numrecords == 3
@@ -0,0 +1,45 @@
+import io
+import threading
+from pytest import raises
+from .dbf import DBF
+from .readahead import read_chunks, read_ahead
+from .conftest import people
+
+
+def _reader_threads():
+    return [thread for thread in threading.enumerate()
+            if thread.name == 'dbfread read-ahead']
+
+
+def test_read_chunks():
+    data = b'0123456789'
+    assert list(read_chunks(io.BytesIO(data), 4)) == [b'0123', b'4567', b'89']
+    assert list(read_chunks(io.BytesIO(data), 4, limit=6)) == [b'0123', b'45']
+    assert list(read_ahead(io.BytesIO(data), 4, maxchunks=1)) == \
+        [b'0123', b'4567', b'89']
+
+
+def test_read_ahead_stops_early():
+    chunks = read_ahead(io.BytesIO(b'x' * 1000), 10, maxchunks=2)
+    assert next(chunks) == b'x' * 10
+    chunks.close()
+    assert _reader_threads() == []
+
+
+def test_read_ahead_error():
+    class BrokenFile(object):
+        def read(self, size):
+            raise IOError('network is down')
+
+    with raises(IOError):
+        list(read_ahead(BrokenFile(), 10))
+    assert _reader_threads() == []
+
+
+def test_table_readahead(people_dbf):
+    table = DBF(people_dbf, readahead=True)
+    assert list(table) == people
+    assert list(table.iter_records(1)) == people[1:]
+    assert table.read_columns(['NAME'])['NAME'] == [u'Alice', u'Bob']
+    assert [len(batch) for batch in table.iter_batches(1)] == [1, 1]
+    assert _reader_threads() == []
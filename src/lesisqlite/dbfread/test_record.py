@@ -0,0 +1,47 @@
+import pickle
+from .dbf import DBF
+from .record import Record, LazyRecord, make_record_class, _missing
+from .conftest import people
+
+def test_record_table(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, recfactory=Record, use_mmap=use_mmap)
+        records = list(table)
+        assert records == people
+        assert table[1] == people[1]
+
+        alice = records[0]
+        assert isinstance(alice, tuple)
+        assert alice['NAME'] == alice.NAME == alice.get('NAME') == u'Alice'
+        assert alice.get('MISSING', 1) == 1
+        assert list(alice) == alice.keys() == \
+            [u'NAME', u'BIRTHDATE', u'KIDS', u'HEIGHT', u'MARRIED']
+        assert alice.items()[0] == (u'NAME', u'Alice')
+        assert dict(alice) == people[0]
+
+def test_record_class_is_shared():
+    assert make_record_class(['A', 'B']) is make_record_class(['A', 'B'])
+
+def test_record_pickle():
+    record = make_record_class(['A', 'B'])([1, u'x'])
+    copy = pickle.loads(pickle.dumps(record, 2))
+    assert copy == record
+    assert copy.B == u'x'
+
+def test_lazy_record(people_dbf):
+    for use_mmap in [True, False]:
+        table = DBF(people_dbf, recfactory=LazyRecord, use_mmap=use_mmap)
+        alice = table[0]
+        assert alice._cache == [_missing] * 5
+        assert alice.NAME == alice['NAME'] == u'Alice'
+        assert alice._cache[0] == u'Alice'
+        assert alice._cache[1:] == [_missing] * 4
+        assert list(alice) == list(table.field_names)
+
+        assert list(table) == people
+        assert list(table.iter_batches()) == [people]
+
+def test_lazy_record_fields(people_dbf):
+    table = DBF(people_dbf, recfactory=LazyRecord, fields=['KIDS'])
+    assert [record.items() for record in table] == [[(u'KIDS', 2)],
+                                                    [(u'KIDS', None)]]
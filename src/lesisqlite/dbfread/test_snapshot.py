@@ -0,0 +1,55 @@
+import os
+from .dbf import DBF
+from .record import Record, LazyRecord
+from .conftest import write_dbf, people, PEOPLE_FIELDS, PEOPLE_RECORDS
+
+
+class NoDecodeDBF(DBF):
+    """Table that fails if records are decoded from the file."""
+    def _read_columns(self, fields=None):
+        raise AssertionError('table was decoded')
+
+
+def test_snapshot(tmpdir):
+    filename = write_dbf(tmpdir.join('people.dbf'), PEOPLE_FIELDS,
+                         PEOPLE_RECORDS)
+    cache_dir = os.path.join(str(tmpdir), 'cache')
+
+    assert list(DBF(filename, cache_dir=cache_dir)) == people
+    assert len(os.listdir(cache_dir)) == 1
+
+    table = NoDecodeDBF(filename, cache_dir=cache_dir)
+    assert list(table) == people
+    assert table.read_columns(['NAME']) == {'NAME': [u'Alice', u'Bob']}
+    table = NoDecodeDBF(filename, cache_dir=cache_dir, recfactory=Record,
+                        fields=['KIDS', 'NAME'])
+    assert [tuple(record.values()) for record in table] == [(u'Alice', 2),
+                                                           (u'Bob', None)]
+
+
+def test_snapshot_not_used(tmpdir):
+    filename = write_dbf(tmpdir.join('people.dbf'), PEOPLE_FIELDS,
+                         PEOPLE_RECORDS)
+    cache_dir = os.path.join(str(tmpdir), 'cache')
+    list(DBF(filename, cache_dir=cache_dir))
+
+    # Lazy records and partial reads decode from the file.
+    assert list(NoDecodeDBF(filename, cache_dir=cache_dir,
+                            recfactory=LazyRecord)) == people
+    assert list(NoDecodeDBF(filename,
+                            cache_dir=cache_dir).iter_records(1)) == people[1:]
+
+    # Other options give other values.
+    table = DBF(filename, cache_dir=cache_dir, lowernames=True)
+    assert next(iter(table))['name'] == u'Alice'
+
+
+def test_snapshot_invalidated(tmpdir):
+    filename = write_dbf(tmpdir.join('people.dbf'), PEOPLE_FIELDS,
+                         PEOPLE_RECORDS)
+    cache_dir = os.path.join(str(tmpdir), 'cache')
+    list(DBF(filename, cache_dir=cache_dir))
+
+    write_dbf(filename, PEOPLE_FIELDS, PEOPLE_RECORDS[:1])
+    os.utime(filename, (0, 0))
+    assert list(DBF(filename, cache_dir=cache_dir)) == people[:1]
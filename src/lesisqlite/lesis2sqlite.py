@@ -30,15 +30,39 @@ import os
 import time
 import threading
 import sqlite3
+from multiprocessing.pool import ThreadPool
 
 from osgeo import ogr, osr
 
-from dbfread import DBF
+from dbfread import DBF, Record, LazyRecord
+from dbfread.cachefile import get_user_cache_dir
 
 from shape2sqlite import shape2sqlite, create_new_plg_layer
 
 LESIS_ENCODING = "866"
 
+# Number of distinct values of a text field kept decoded by dbfread.
+DECODE_CACHE_SIZE = 10000
+
+# Read PHL tables in a background thread, LesIS bases are often on
+# network shares.
+READ_AHEAD = True
+
+# Decoded snapshots of reference tables, reused between conversions,
+# are kept in a per-user directory with this name in the temp directory.
+REFERENCE_CACHE_NAME = "lesis2sqlite"
+# Set by getReferenceCacheDir() when the directory is first needed.
+_reference_cache_dir = None
+
+# Number of reference tables loaded at the same time.
+REFERENCE_LOAD_THREADS = 4
+
+# Number of rows inserted into a table with one executemany().
+INSERT_BATCH_SIZE = 1000
+
+# Number of inserted rows after which the sqlite transaction is committed.
+COMMIT_INTERVAL = 50000
+
 typemap = {
     'F': 'FLOAT',
     'L': 'BOOLEAN',
@@ -76,19 +100,64 @@ class LesisFileStructure(object):
             self.__fields_dbf = None
             raise ValueError("Fields.DBF not found!")
 
-    def getDBFbyName(self, dbf_name):
+        self.__reference_dbfs = {}
+        self.refreshDBFIndex()
+
+    def refreshDBFIndex(self):
+        """Index reference DBF files by lowercase name without extension.
+
+        Call this if files in the reference directories have changed.
+        """
+        reference_dbfs = {}
         for reference_data_dir in self.__reference_data_dirs:
+            if not os.path.isdir(reference_data_dir):
+                continue
+
             for f in os.listdir(reference_data_dir):
                 if os.path.splitext(f)[1].lower() != ".dbf":
                     continue
 
-                if os.path.splitext(f)[0].lower() == os.path.splitext(dbf_name)[0].lower():
-                    return os.path.join(reference_data_dir, f)
-        return None
+                # Files in directories that come first win
+                dbf_name = os.path.splitext(f)[0].lower()
+                if dbf_name not in reference_dbfs:
+                    reference_dbfs[dbf_name] = os.path.join(reference_data_dir, f)
+
+        self.__reference_dbfs = reference_dbfs
+
+    def getDBFbyName(self, dbf_name):
+        return self.__reference_dbfs.get(os.path.splitext(dbf_name)[0].lower())
 
     def getFieldsDBFFile(self):
         return self.__fields_dbf
 
+    def getDBFStats(self, errors=None):
+        """Return the number of records (including deleted ones) of
+        every DBF file in the base directory.
+
+        Files that can't be opened are skipped. If errors is a list, a
+        message for each of them is added to it.
+        """
+        stats = {}
+        for dirpath, dirnames, filenames in os.walk(self.__base_dir):
+            for f in filenames:
+                if os.path.splitext(f)[1].lower() != ".dbf":
+                    continue
+
+                dbf_file = os.path.join(dirpath, f)
+                try:
+                    dbf_table = DBF(
+                        dbf_file,
+                        ignorecase=False,
+                        encoding=LESIS_ENCODING,
+                        ignore_missing_memofile=True
+                    )
+                    stats.update({dbf_file: dbf_table.numrecords})
+                except Exception as err:
+                    if errors is not None:
+                        errors.append("Read %s error: %s" % (dbf_file, str(err)))
+
+        return stats
+
     def getPHLDataFiles(self):
         dataFiles = []
         for data_dir in self.__data_dirs:
@@ -106,11 +175,26 @@ class LesisFileStructure(object):
         return dataFiles
 
 
+def getReferenceCacheDir():
+    """Return the directory for reference table snapshots.
+
+    It is created the first time it is needed. Returns None (no
+    snapshots) if the per-user directory is not private.
+    """
+    global _reference_cache_dir
+    if _reference_cache_dir is None:
+        _reference_cache_dir = get_user_cache_dir(REFERENCE_CACHE_NAME)
+    return _reference_cache_dir
+
+
 def getFieldsDescFromDBF(dbf_fields_file):
     dbf_table = DBF(
         dbf_fields_file,
         lowernames=True,
-        encoding=LESIS_ENCODING
+        encoding=LESIS_ENCODING,
+        decode_cache_size=DECODE_CACHE_SIZE,
+        recfactory=Record,
+        cache_dir=getReferenceCacheDir()
     )
 
     fields_desc = {}
@@ -311,6 +395,127 @@ class ConverterErrorException(Exception):
         super(ConverterErrorException, self).__init__(message)
 
 
+class SQLiteSession(object):
+    """One sqlite connection shared by all conversion stages
+
+    The connection is opened when first used, with an explicit
+    transaction that is committed at the end of each stage and every
+    commit_interval changed rows. release() commits and closes the
+    connection, so that the OGR datasource can open the same file.
+    """
+    def __init__(self, filename, commit_interval=COMMIT_INTERVAL):
+        self.__filename = filename
+        self.__commit_interval = commit_interval
+        self.__conn = None
+        self.__changes = 0
+
+    def cursor(self):
+        if self.__conn is None:
+            # Transactions are started and ended here, not by sqlite3.
+            self.__conn = sqlite3.connect(self.__filename, isolation_level=None)
+            self.__conn.execute("PRAGMA foreign_keys = ON")
+            self.__conn.execute("BEGIN")
+
+        return self.__conn.cursor()
+
+    def changed(self, count=1):
+        self.__changes += count
+        if self.__changes >= self.__commit_interval:
+            self.commit()
+
+    def commit(self):
+        if self.__conn is not None:
+            self.__conn.execute("COMMIT")
+            self.__conn.execute("BEGIN")
+        self.__changes = 0
+
+    def release(self):
+        if self.__conn is not None:
+            self.__conn.execute("COMMIT")
+            self.__conn.close()
+            self.__conn = None
+        self.__changes = 0
+
+    def close(self):
+        """Close the connection, changes that are not committed are lost"""
+        if self.__conn is not None:
+            self.__conn.close()
+            self.__conn = None
+        self.__changes = 0
+
+
+class BatchInserter(object):
+    """Insert rows into sqlite tables in batches
+
+    Rows for the same table and columns share one statement and are
+    inserted with executemany(). Insert errors are added to the errors
+    list, one message per failed row. With replace=True rows replace
+    existing rows with the same key.
+    """
+    def __init__(self, cursor, errors, batch_size=INSERT_BATCH_SIZE, replace=False):
+        self.__cursor = cursor
+        self.__errors = errors
+        self.__batch_size = batch_size
+        self.__verb = "insert or replace" if replace else "insert"
+        self.__statements = {}
+        self.__batches = {}
+
+    def insert(self, table_name, columns, values):
+        key = (table_name, tuple(columns))
+        rows = self.__batches.get(key)
+        if rows is None:
+            rows = self.__batches[key] = []
+
+        rows.append(values)
+        if len(rows) >= self.__batch_size:
+            self.__flushBatch(key)
+
+    def flush(self):
+        for key in self.__batches.keys():
+            self.__flushBatch(key)
+
+    def __getStatement(self, key):
+        sql = self.__statements.get(key)
+        if sql is None:
+            table_name, columns = key
+            sql = "%s into %s (%s) values (%s)" % (
+                self.__verb,
+                table_name,
+                ", ".join(columns),
+                ", ".join(["?" for column in columns]),
+            )
+            self.__statements[key] = sql
+
+        return sql
+
+    def __flushBatch(self, key):
+        rows = self.__batches.pop(key, None)
+        if not rows:
+            return
+
+        sql = self.__getStatement(key)
+
+        # executemany() stops at the first failed row, all rows before
+        # it are inserted. Count the rows it has taken to know where.
+        taken = [0]
+        def counted_rows():
+            for row in rows:
+                taken[0] += 1
+                yield row
+
+        try:
+            self.__cursor.executemany(sql, counted_rows())
+        except Exception:
+            for row in rows[max(taken[0] - 1, 0):]:
+                try:
+                    self.__cursor.execute(sql, row)
+                except Exception as err:
+                    self.__errors.append("Insert into %s error: %s" % (
+                        key[0],
+                        str(err)
+                    ))
+
+
 class Converter(object):
     RETURN_CODE_SUCCESS     = 0
     RETURN_CODE_ERROR       = 1
@@ -344,10 +549,11 @@ class Converter(object):
         self.__lesis_base_dir   = lesis_base_dir
         self.__shape_filename   = shape_filename
         self.__sqlite_filename  = sqlite_filename
+        self.__session = SQLiteSession(sqlite_filename)
 
         self.__lfs = None
         self.__lessis_fields_struct = {}
-        self.__reference_cash = {}
+        self.__references = {}
         self.__aliases = []
 
         self.__current_convert_status = self.CONVERT_STATE_WAIT
@@ -356,6 +562,7 @@ class Converter(object):
         self.videlLayerName = "videl_plg"
         self.kvrLayerName = "kvr_plg"
         self.yarporLayerName = "yarpor_attr"
+        self.phl1StagingTableName = "phl1_staging"
         self.alias_table_name = "aliases"
 
         self.maket_table_name_pattern = u"maket_%s"
@@ -422,6 +629,8 @@ class Converter(object):
             self.__createAliasesTable()
             self.__setStatusMessage("Finish")
 
+            self.__session.release()
+
             result = self.RETURN_CODE_SUCCESS
 
         except ConverterErrorException as err:
@@ -432,6 +641,10 @@ class Converter(object):
         except ConverterInteruptException:
             result = self.RETURN_CODE_INTERUPT
 
+        finally:
+            # Drops the stage that was interrupted or failed.
+            self.__session.close()
+
         return result
 
     def __setStatus(self, status):
@@ -490,6 +703,9 @@ class Converter(object):
 
     def __getSQLiteDS(self):
         sqlite_ds = None
+
+        # OGR uses its own connection, do not hold the database lock.
+        self.__session.release()
         
         if os.path.isfile(self.__sqlite_filename):
             sqlite_ds = ogr.Open(self.__sqlite_filename, True)
@@ -555,8 +771,7 @@ class Converter(object):
         return layer_name
 
     def __createKvrLayer(self):
-        conn = sqlite3.connect(self.__sqlite_filename)
-        cur = conn.cursor()
+        cur = self.__session.cursor()
 
         sql = "select DISTINCT nomkvr from %s" % self.videlLayerName
         cur.execute(sql)
@@ -564,7 +779,6 @@ class Converter(object):
         kvrs_nums = [kvr_info[0] for kvr_info in cur.fetchall()]
 
         cur.close()
-        conn.close()
 
         sqlite_ds = self.__getSQLiteDS()
 
@@ -645,56 +859,90 @@ class Converter(object):
         return self.__getDBFValueByDBF((ref_dbf_file, field_value))
 
     def __getDBFValueByDBF(self, (ref_dbf_file, field_value)):
-        dbf_field_value = unicode(field_value)
+        references = self.__references.get(ref_dbf_file)
+        if references is None:
+            references = self.__loadReferences(ref_dbf_file)
+            self.__references[ref_dbf_file] = references
+
+        return references.get(unicode(field_value))
+
+    def __preloadReferences(self, field_names):
+        ref_dbf_files = set()
+        for field_name in field_names:
+            field_desc = self.__lessis_fields_struct.get(field_name)
+            if field_desc is None or field_desc[u"ref"] in ["", None]:
+                continue
+            ref_dbf_file = self.__lfs.getDBFbyName(field_desc[u"ref"])
+            if ref_dbf_file is not None and ref_dbf_file not in self.__references:
+                ref_dbf_files.add(ref_dbf_file)
+
+        if not ref_dbf_files:
+            return
 
+        ref_dbf_files = list(ref_dbf_files)
+        pool = ThreadPool(min(REFERENCE_LOAD_THREADS, len(ref_dbf_files)))
         try:
-            return self.__reference_cash[(ref_dbf_file, dbf_field_value)]
-        except KeyError:
-            ref_dbf_table = DBF(
-                ref_dbf_file,
-                lowernames=True,
-                encoding=LESIS_ENCODING
-            )
-            
-            kl_type = u"N"
-            for dbf_field in ref_dbf_table.fields:
-                if dbf_field.name == u"kl":
-                    kl_type = dbf_field.type
+            references = pool.map(self.__loadReferences, ref_dbf_files)
+        finally:
+            pool.terminate()
+            pool.join()
+
+        self.__references.update(zip(ref_dbf_files, references))
+
+    def __loadReferences(self, ref_dbf_file):
+        """Return a dict of kl (as text) => tx for a reference table"""
+        ref_dbf_table = DBF(
+            ref_dbf_file,
+            lowernames=True,
+            encoding=LESIS_ENCODING,
+            decode_cache_size=DECODE_CACHE_SIZE,
+            recfactory=Record,
+            cache_dir=getReferenceCacheDir()
+        )
 
-            is_found = False
-            for row in ref_dbf_table:
-                # TODO get find KL and TX field exception
-                kl = row.get(u"kl")
-                if kl_type in [u"I", u"F", u"N", u"0"] and kl is None:
-                    kl = 0
-                kl = unicode(kl)
-                tx = row.get(u"tx", None)
+        kl_type = u"N"
+        for dbf_field in ref_dbf_table.fields:
+            if dbf_field.name == u"kl":
+                kl_type = dbf_field.type
 
-                if dbf_field_value == kl:
-                    is_found = True
-                    kl = dbf_field_value
+        ref_fields = [field_name for field_name in [u"kl", u"tx"] if field_name in ref_dbf_table.field_names]
+        columns = ref_dbf_table.read_columns(ref_fields)
+        if ref_fields:
+            records_count = len(columns[ref_fields[0]])
+        else:
+            records_count = len(ref_dbf_table)
 
-                self.__reference_cash.update({(ref_dbf_file, kl): tx})
+        kls = columns.get(u"kl", [None] * records_count)
+        txs = columns.get(u"tx", [None] * records_count)
 
-            if not is_found:
-                self.__reference_cash.update({(ref_dbf_file, dbf_field_value): None})
+        references = {}
+        for kl, tx in zip(kls, txs):
+            # TODO get find KL and TX field exception
+            if kl_type in [u"I", u"F", u"N", u"0"] and kl is None:
+                kl = 0
+            # The last record with a kl wins.
+            references[unicode(kl)] = tx
 
-            return self.__reference_cash[(ref_dbf_file, dbf_field_value)]
+        return references
 
     def __processPhl1(self):
         phl1_dbf_file = self.__lfs.getPHLDataFiles()[0]['phl1']
 
+        # Most PHL1 fields are not exported, so decode only on access.
         dbf_table = DBF(
             phl1_dbf_file,
             lowernames=True,
-            encoding=LESIS_ENCODING
+            encoding=LESIS_ENCODING,
+            decode_cache_size=DECODE_CACHE_SIZE,
+            recfactory=LazyRecord,
+            readahead=READ_AHEAD
         )
 
-        conn = sqlite3.connect(self.__sqlite_filename)
-        cur = conn.cursor()
+        cur = self.__session.cursor()
 
         cur.execute("PRAGMA table_info(%s)" % self.videlLayerName)
-        existing_fileds = [field[1] for field in cur.fetchall()]
+        existing_fileds_types = dict([(field[1], field[2]) for field in cur.fetchall()])
+        existing_fileds = existing_fileds_types.keys()
 
         export_fields = []
         for export_field in dbf_table.fields:
@@ -722,45 +970,84 @@ class Converter(object):
             cur.execute(sql)
             export_fields.append(field_name)
 
-        conn.commit()
+        self.__session.commit()
+
+        self.__preloadReferences(export_fields)
+
+        if len(export_fields) == 0:
+            return
+
+        # PHL1 values are collected in a staging table keyed by videl and
+        # copied to the videl layer with one update.
+        # INSERT OR REPLACE keeps the last PHL1 record of each videl.
+        # Key columns have the types of the videl layer columns, so the
+        # key index can be used in the update.
+        key_fields = [u"nomkvr", u"nomvyd"]
+        if set(key_fields) & set(export_fields):
+            # The keys were just added to the layer, so they are empty
+            # and no videl will match.
+            self.__exceptions.append("Layer %s has no nomkvr and nomvyd fields, PHL1 records can't be joined to videls" % (
+                self.videlLayerName
+            ))
+
+        # Exported key fields are staged once, as keys.
+        staged_fields = [field_name for field_name in export_fields if field_name not in key_fields]
+        cur.execute("create temp table %s (%s, primary key (nomkvr, nomvyd))" % (
+            self.phl1StagingTableName,
+            ", ".join(
+                ["%s %s" % (field_name, existing_fileds_types.get(field_name, "")) for field_name in key_fields] +
+                staged_fields
+            )
+        ))
+
+        # A failed row is reported and skipped, the other rows are
+        # still staged.
+        inserter = BatchInserter(cur, self.__exceptions, replace=True)
+        columns = key_fields + staged_fields
 
-        videl_count = dbf_table._count_records()
+        videl_count = len(dbf_table)
         videl_index = 1
         for row in dbf_table:
-            
+
             if self.__interupt.isSet():
                 raise ConverterInteruptException("Interupt")
 
             nomkvr = row.get(u"nomkvr", None)
             nomvyd = row.get(u"nomvyd", None)
-            
+
             if nomkvr is None or nomvyd is None:
                 continue
-            
-            values = [(v[0], self.__getDBFValueByField(v)) for v in row.items() if v[0] in export_fields]
 
-            try:
-                sql = "update %s set %s where nomkvr = %s and nomvyd = %s" % (
-                    self.videlLayerName,
-                    ", ".join(["%s=?" % v[0] for v in values]),
-                    nomkvr,
-                    nomvyd   
-                )
+            values = [self.__getDBFValueByField((field_name, row.get(field_name))) for field_name in staged_fields]
+            inserter.insert(self.phl1StagingTableName, columns, [nomkvr, nomvyd] + values)
 
-                cur.execute(sql, [v[1] for v in values])
+            self.__setStatusMessage("Process %d from %d videls" % (videl_index, videl_count))
+            videl_index += 1
 
-                self.__setStatusMessage("Process %d from %d videls" % (videl_index, videl_count))
+        inserter.flush()
 
-                videl_index += 1
-            except Exception as err:
-                self.__exceptions.append("Update %s where nomkvr = %s and nomvyd = %s error: %s" % (
-                    self.videlLayerName,
-                    nomkvr,
-                    nomvyd,
-                    str(err)
-                ))
+        # UPDATE ... FROM is not available in older SQLite versions.
+        staging_row = "select %%s from %s as phl1 where phl1.nomkvr = %s.nomkvr and phl1.nomvyd = %s.nomvyd" % (
+            self.phl1StagingTableName,
+            self.videlLayerName,
+            self.videlLayerName
+        )
+        try:
+            sql = "update %s set %s where exists (%s)" % (
+                self.videlLayerName,
+                ", ".join(["%s = (%s)" % (field_name, staging_row % ("phl1." + field_name)) for field_name in export_fields]),
+                staging_row % "1"
+            )
+            cur.execute(sql)
+        except sqlite3.Error as err:
+            self.__exceptions.append("Update %s from %s error: %s" % (
+                self.videlLayerName,
+                self.phl1StagingTableName,
+                str(err)
+            ))
 
-        conn.commit()
+        cur.execute("drop table %s" % self.phl1StagingTableName)
+        self.__session.commit()
 
     def __processPhl2(self):
         phl2_dbf_file = self.__lfs.getPHLDataFiles()[0]['phl2']
@@ -768,7 +1055,10 @@ class Converter(object):
         dbf_table = DBF(
             phl2_dbf_file,
             lowernames=True,
-            encoding=LESIS_ENCODING
+            encoding=LESIS_ENCODING,
+            decode_cache_size=DECODE_CACHE_SIZE,
+            recfactory=Record,
+            readahead=READ_AHEAD
         )
 
         fields = []
@@ -791,11 +1081,7 @@ class Converter(object):
             else:
                 self.__exceptions.append(u"Field %s not present in Fields.DBF" % field_name)
 
-        conn = sqlite3.connect(self.__sqlite_filename)
-        cur = conn.cursor()
-
-        cur.execute("PRAGMA foreign_keys = ON")
-        conn.commit()
+        cur = self.__session.cursor()
 
         sql = "CREATE TABLE %s (%s, %s)" % (
             self.yarporLayerName,
@@ -803,43 +1089,38 @@ class Converter(object):
             "videl_id INTEGER REFERENCES %s(ogc_fid)" % (self.videlLayerName,)
         )
         cur.execute(sql)
-        conn.commit()
+        self.__session.commit()
         self.__aliases.append([self.yarporLayerName, None, u"Ярусы"])
 
         videls = self.__getVidels(cur)
 
-        yar_count = dbf_table._count_records()
-        yar_index = 1
-        for row in dbf_table:
-            
-            if self.__interupt.isSet():
-                raise ConverterInteruptException("Interupt")
+        self.__preloadReferences(dbf_table.field_names)
 
-            nnn = unicode(row.get(u"nnn", None))
-            fields = [(v[0], self.__getDBFValueByField(v)) for v in row.items()]        
+        inserter = BatchInserter(cur, self.__exceptions)
+        columns = dbf_table.field_names + ["videl_id"]
 
-            try:
-                sql = "insert into %s (%s, videl_id) values (%s, ?)" % (
-                    self.yarporLayerName,
-                    ", ".join([field[0] for field in fields]),
-                    ", ".join(["?" for field in fields]),
-                )
+        yar_count = len(dbf_table)
+        yar_index = 1
+        # Read in batches so text columns are decoded a batch at a time.
+        for batch in dbf_table.iter_batches(INSERT_BATCH_SIZE):
+            for row in batch:
+
+                if self.__interupt.isSet():
+                    raise ConverterInteruptException("Interupt")
 
-                values = [field[1] for field in fields]
+                nnn = unicode(row.get(u"nnn", None))
+                values = [self.__getDBFValueByField(v) for v in row.items()]
                 values.append(videls.get(nnn))
 
-                cur.execute(sql, values)
+                inserter.insert(self.yarporLayerName, columns, values)
+                self.__session.changed()
 
                 self.__setStatusMessage("Process %d from %d yaruses" % (yar_index, yar_count))
 
                 yar_index += 1
-            except Exception as err:
-                self.__exceptions.append("Insert into %s error: %s" % (
-                    self.yarporLayerName,
-                    str(err)
-                ))
 
-        conn.commit()
+        inserter.flush()
+        self.__session.commit()
 
     def __getVidels(self, cur):
         sql = "select ogc_fid, nnn from %s" % (
@@ -862,7 +1143,10 @@ class Converter(object):
         dbf_table = DBF(
             phl3_dbf_file,
             lowernames=True,
-            encoding=LESIS_ENCODING
+            encoding=LESIS_ENCODING,
+            decode_cache_size=DECODE_CACHE_SIZE,
+            recfactory=Record,
+            readahead=READ_AHEAD
         )
 
         fields = {}
@@ -870,16 +1154,18 @@ class Converter(object):
             fields[field.name] = field.type
 
         makets_ids = set()
-        for row in dbf_table:
-            makets_ids.add(row.get(u"maket", None))
+        if u"maket" in dbf_table.field_names:
+            makets_ids.update(dbf_table.read_columns([u"maket"])[u"maket"])
+        elif dbf_table.numrecords > 0:
+            makets_ids.add(None)
                 
         referenced_fields =  self.__createMaketsTables(makets_ids, fields)
-        conn = sqlite3.connect(self.__sqlite_filename)
-        cur = conn.cursor()
+        cur = self.__session.cursor()
 
         videls = self.__getVidels(cur)
+        inserter = BatchInserter(cur, self.__exceptions)
 
-        maket_count = dbf_table._count_records()
+        maket_count = len(dbf_table)
         maket_index = 1
         for row in dbf_table:
             if self.__interupt.isSet():
@@ -914,17 +1200,14 @@ class Converter(object):
             values.append(videl_fid)
 
             maket_table_name = self.maket_table_name_pattern % maket_id
-            sql = "insert into %s (%s) values (%s)" % (
-                maket_table_name,
-                ", ".join([field for field in fields]),
-                ", ".join(["?" for field in fields]),
-            )
-            cur.execute(sql, values)
+            inserter.insert(maket_table_name, fields, values)
+            self.__session.changed()
 
             self.__setStatusMessage("Process %d from %d makets" % (maket_index, maket_count))
             maket_index += 1
 
-        conn.commit()
+        inserter.flush()
+        self.__session.commit()
 
     def __createMaketsTables(self, makets_ids, fields):
         makets_dbf = self.__lfs.getDBFbyName(u"makets")
@@ -936,7 +1219,10 @@ class Converter(object):
         dbf_table = DBF(
             makets_dbf,
             lowernames=True,
-            encoding=LESIS_ENCODING
+            encoding=LESIS_ENCODING,
+            decode_cache_size=DECODE_CACHE_SIZE,
+            recfactory=Record,
+            cache_dir=getReferenceCacheDir()
         )
 
         makets_tables_struct = {}
@@ -995,11 +1281,7 @@ class Converter(object):
 
     def __createMaketTable(self, maket_id, fields):
         maket_table_name = self.maket_table_name_pattern % maket_id
-        conn = sqlite3.connect(self.__sqlite_filename)
-        cur = conn.cursor()
-
-        cur.execute("PRAGMA foreign_keys = ON")
-        conn.commit()
+        cur = self.__session.cursor()
 
         sql = "CREATE TABLE %s (%s, %s)" % (
             maket_table_name,
@@ -1007,19 +1289,18 @@ class Converter(object):
             "videl_id INTEGER REFERENCES %s(ogc_fid)" % (self.videlLayerName,)
         )
 
+        # Committed with the PHL3 rows
         cur.execute(sql)
-        conn.commit()
 
     def __createAliasesTable(self):
-        conn = sqlite3.connect(self.__sqlite_filename)
-        cur = conn.cursor()
+        cur = self.__session.cursor()
 
         sql = "CREATE TABLE %s (table_name TEXT, field_name TEXT, alias TEXT)" % (
             self.alias_table_name
         )
 
         cur.execute(sql)
-        conn.commit()
+        self.__session.commit()
 
         for alias in self.__aliases:
             if self.__interupt.isSet():
@@ -1031,7 +1312,7 @@ class Converter(object):
                 "?, ?, ?",
             )
             cur.execute(sql, alias)
-        conn.commit()            
+        self.__session.commit()            
 
     # def __addAlias(self, table_name, field_name, alias):
     #     conn = sqlite3.connect(self.__sqlite_filename)